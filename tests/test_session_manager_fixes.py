@@ -71,6 +71,36 @@ def test_session_manager_integration():
         traceback.print_exc()
         return False
 
+def test_duplicate_event_not_reported_as_captured():
+    """Logging the same event twice inside the dedup window only captures it once"""
+    import os
+    import tempfile
+    from pathlib import Path
+
+    print("🔧 Testing auto-capture deduplication...")
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            Path("data").mkdir()
+            from tools.session_manager_tool import EnhancedSessionTool
+
+            session_tool = EnhancedSessionTool()
+            assert session_tool.memory_tool is not None
+            session_tool.bb7_start_session("Auto-capture dedup")
+            first = session_tool.bb7_log_event("breakthrough", "Found the root cause of the stall")
+            second = session_tool.bb7_log_event("breakthrough", "Found the root cause of the stall")
+            assert "Auto-captured in memory (total: 1)" in first, first
+            assert "Auto-captured" not in second, second
+            events = session_tool.current_session["episodic"]["events"]
+            assert [e["auto_analyzed"] for e in events] == [True, False]
+            assert session_tool.current_session["intelligence"]["auto_captured_memories"] == 1
+            print("   ✅ Duplicate event not reported as captured")
+            session_tool.shutdown()
+        finally:
+            os.chdir(original_cwd)
+
 if __name__ == "__main__":
+    test_duplicate_event_not_reported_as_captured()
     success = test_session_manager_integration()
     sys.exit(0 if success else 1)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test that commands run without /bin/sh print what the shell would have printed
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def test_direct_commands_match_shell_output():
+    """Builtins and non-ASCII arguments go through the shell, so their output is unchanged"""
+    print("🧪 Testing run_command output against /bin/sh")
+    if os.name != 'posix' or shutil.which("echo") is None:
+        print("⏭️ no POSIX shell, skipping")
+        return
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            Path("data").mkdir()
+            from tools.shell_tool import ShellTool, _direct_argv
+
+            shell = ShellTool()
+            for command in ("echo -e x", "echo a b"):
+                assert _direct_argv(command) is None, command
+                expected = subprocess.run(command, shell=True, capture_output=True,
+                                          text=True).stdout.strip()
+                result = shell.run_command(command)
+                assert "Exit code: 0" in result, result
+                assert f"STDOUT:\n{expected}" in result, (expected, result)
+                print(f"✅ {command!r} printed {expected!r}")
+
+            assert _direct_argv("ls -la") == ["ls", "-la"]
+            print("✅ plain ASCII commands still skip the shell")
+            shell.shutdown()
+        finally:
+            os.chdir(original_cwd)
+
+
+if __name__ == "__main__":
+    test_direct_commands_match_shell_output()
+    print("🎉 direct argv test passed")
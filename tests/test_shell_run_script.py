@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test that scripts run by ShellTool.run_script cannot read their own source from stdin
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def test_stdin_readers_do_not_consume_script():
+    """Commands that read stdin see EOF and the rest of the script still runs"""
+    print("🧪 Testing run_script with stdin readers")
+    if shutil.which("bash") is None:
+        print("⏭️ bash not available, skipping")
+        return
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            Path("data").mkdir()
+            from tools.shell_tool import ShellTool
+
+            shell = ShellTool()
+            script = 'echo start\nhead -n1 >/dev/null\nread line\necho "read=[$line]"\necho end\n'
+            result = shell.run_script(script, "bash")
+            assert "Exit code: 0" in result, result
+            assert "start" in result and "end" in result, result
+            assert "read=[]" in result, result
+            print("✅ bash script ran past head and read")
+
+            result = shell.run_script("import sys\nprint(sys.stdin.read() == '', sys.argv[0])", "python")
+            assert "True -c" in result, result
+            print("✅ python script sees an empty stdin")
+            shell.shutdown()
+        finally:
+            os.chdir(original_cwd)
+
+
+if __name__ == "__main__":
+    test_stdin_readers_do_not_consume_script()
+    print("🎉 run_script stdin test passed")
@@ -9,7 +9,7 @@ activating relevant context for seamless collaboration continuity.
 from typing import Dict, Any, List, Optional, Callable
 from tools.memory_tool import EnhancedMemoryTool
 from tools.memory_interconnect import MemoryInterconnectionEngine
-from tools.session_manager_tool import EnhancedSessionTool
+from tools.session_manager_tool import EnhancedSessionTool, to_seconds, read_session
 from tools.visual_tool import VisualTool
 from tools.terminal_tool import TerminalTool
 from tools.code_analysis_tool import CodeAnalysisTool
@@ -50,7 +50,7 @@ class AutoTool:
             "shell": ["bb7_run_command", "bb7_run_script", "bb7_get_environment", "bb7_list_processes", "bb7_kill_process", "bb7_get_system_info"],
             "web": ["bb7_fetch_url", "bb7_download_file", "bb7_check_url_status", "bb7_search_web", "bb7_extract_links"],
             "sessions": ["bb7_start_session", "bb7_log_event", "bb7_capture_insight", "bb7_record_workflow", "bb7_update_focus", 
-                        "bb7_pause_session", "bb7_resume_session", "bb7_list_sessions", "bb7_get_session_summary", 
+                        "bb7_pause_session", "bb7_resume_session", "bb7_list_sessions", "bb7_get_session_summary", "bb7_export_session_json",
                         "bb7_get_session_insights", "bb7_cross_session_analysis", "bb7_session_recommendations", 
                         "bb7_learned_patterns", "bb7_session_intelligence", "bb7_link_memory_to_session", "bb7_auto_memory_stats"],
             "visual": ["bb7_screen_capture", "bb7_screen_monitor", "bb7_visual_diff", "bb7_window_manager", 
@@ -139,21 +139,15 @@ class AutoTool:
                 sessions_dir = self.data_dir / "sessions"
                 if sessions_dir.exists():
                     try:
-                        session_files = list(sessions_dir.glob("*.json"))
                         active_sessions = []
                         
-                        for session_file in session_files:
-                            try:
-                                with open(session_file, 'r', encoding='utf-8') as f:
-                                    session_data = json.load(f)
-                                if session_data.get("status") == "active":
-                                    active_sessions.append({
-                                        "id": session_data.get("id", session_file.stem),
-                                        "goal": session_data.get("goal", "No goal specified"),
-                                        "created": session_data.get("created", 0)
-                                    })
-                            except:
-                                continue
+                        for session_id, session_data in self._read_session_snapshots(sessions_dir):
+                            if session_data.get("status") == "active":
+                                active_sessions.append({
+                                    "id": session_data.get("id", session_id),
+                                    "goal": session_data.get("goal", "No goal specified"),
+                                    "created": to_seconds(session_data.get("created", 0))
+                                })
                         
                         if active_sessions:
                             context_report.append(f"\n🎯 Active Sessions ({len(active_sessions)}):")
@@ -283,19 +277,12 @@ class AutoTool:
             
             if sessions_dir.exists():
                 try:
-                    session_files = list(sessions_dir.glob("*.json"))
-                    for session_file in session_files:
-                        try:
-                            with open(session_file, 'r', encoding='utf-8') as f:
-                                session_data = json.load(f)
-                            
-                            status = session_data.get("status", "unknown")
-                            if status == "active":
-                                active_sessions.append(session_data)
-                            elif status == "paused":
-                                paused_sessions.append(session_data)
-                        except:
-                            continue
+                    for _, session_data in self._read_session_snapshots(sessions_dir):
+                        status = session_data.get("status", "unknown")
+                        if status == "active":
+                            active_sessions.append(session_data)
+                        elif status == "paused":
+                            paused_sessions.append(session_data)
                 except Exception as e:
                     resume_report.append(f"⚠️ Error reading sessions: {e}")
             
@@ -306,7 +293,7 @@ class AutoTool:
                 resume_report.append(f"\n🟢 ACTIVE SESSIONS FOUND ({len(active_sessions)}):")
                 for session in active_sessions:
                     goal = session.get("goal", "No goal")
-                    last_updated = session.get("last_updated", session.get("created", 0))
+                    last_updated = to_seconds(session.get("last_updated", session.get("created", 0)))
                     time_str = time.strftime('%Y-%m-%d %H:%M', time.localtime(last_updated))
                     resume_report.append(f"  • {goal} (last active: {time_str})")
                     resume_report.append(f"    ID: {session.get('id', 'unknown')}")
@@ -321,7 +308,7 @@ class AutoTool:
                 
                 for session in paused_sessions:
                     goal = session.get("goal", "No goal")
-                    paused_at = session.get("paused_at", session.get("last_updated", 0))
+                    paused_at = to_seconds(session.get("paused_at", session.get("last_updated", 0)))
                     time_str = time.strftime('%Y-%m-%d %H:%M', time.localtime(paused_at))
                     resume_report.append(f"  • {goal} (paused: {time_str})")
                     resume_report.append(f"    ID: {session.get('id', 'unknown')}")
@@ -679,6 +666,23 @@ class AutoTool:
             self.logger.error(f"Error getting recent changes: {e}")
             return f"Error getting recent changes: {str(e)}"
     
+    def _read_session_snapshots(self, sessions_dir: Path):
+        """Yield (session id, data) for each session, plain or zstd-compressed, with pending journal ops replayed; unreadable ones are skipped"""
+        snapshots = {}
+        for path in sessions_dir.glob("*.json"):
+            snapshots.setdefault(path.name[:-5], path)
+        # A compressed snapshot supersedes a plain one left from before it grew past the threshold
+        for path in sessions_dir.glob("*.json.zst"):
+            snapshots[path.name[:-9]] = path
+        for session_id, path in snapshots.items():
+            try:
+                session_data = read_session(path)
+            except Exception as e:
+                self.logger.debug(f"Skipping unreadable session snapshot {path.name}: {e}")
+                continue
+            if isinstance(session_data, dict):
+                yield session_id, session_data
+    
     # Helper methods for project analysis
     def _detect_project_type(self, path: Path) -> Dict[str, Any]:
         """Detect project type and technologies"""
@@ -4,19 +4,24 @@ Enhanced Session Manager Tool - Auto-memory formation and cross-system intellige
 Integrates with enhanced memory system for automatic insight capture
 """
 
+import io
 import json
 import logging
+import mmap
 import time
 import uuid
 import os
+import queue
 import subprocess
-from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple, Callable
 import threading
 import hashlib
 import re
-from collections import Counter, defaultdict
+import functools
+import bisect
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import configparser
 try:
     from tools.memory_tool import EnhancedMemoryTool
@@ -25,6 +30,577 @@ except ImportError:
     ENHANCED_MEMORY_AVAILABLE = False
     EnhancedMemoryTool = None
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Session snapshots larger than this are stored zstd-compressed as {id}.json.zst
+_COMPRESS_MIN_BYTES = 64 * 1024
+
+# Cross-session analysis parses summaries on a thread pool once this many are needed
+_PARALLEL_SUMMARY_MIN = 8
+_SUMMARY_WORKERS = min(8, os.cpu_count() or 1)
+
+# Files at least this large are parsed straight from a read-only mapping
+_MMAP_MIN_BYTES = 64 * 1024
+
+
+def _read_json(path) -> Any:
+    """Parse a JSON file (zstd-compressed if it ends in .zst), using orjson when available"""
+    if str(path).endswith('.zst'):
+        return _decode_json(_read_compressed(path))
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as fh:
+            if os.fstat(fh.fileno()).st_size < _MMAP_MIN_BYTES:
+                return orjson.loads(fh.read())
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            # Parse from the page cache without copying the file into a bytes object
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+    with open(path, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def _read_compressed(path) -> bytes:
+    if not ZSTD_AVAILABLE:
+        raise RuntimeError(f"{path} is zstd-compressed but the zstandard package is not installed")
+    with open(path, 'rb') as fh:
+        return zstandard.ZstdDecompressor().decompress(fh.read())
+
+
+def _content_digest(data: bytes) -> str:
+    """Non-cryptographic hex fingerprint for memory keys; xxh3 when available, else md5"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.md5(data).hexdigest()
+
+
+def _decode_json(data: bytes) -> Any:
+    """Parse UTF-8 JSON bytes, using orjson when available"""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _encode_json(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON (compact unless pretty), using orjson when available"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _write_bytes(path, data: bytes) -> None:
+    """Atomically replace a file: write a temp file, fsync, then rename over the target"""
+    path = Path(path)
+    # Unique per writer so two tool instances saving the same file never share a temp file
+    temp_file = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_file, 'wb') as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(temp_file, path)
+    except BaseException:
+        try:
+            temp_file.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+
+
+# Top-level session keys needed by cross-session analysis
+_SUMMARY_FIELDS = frozenset({"id", "goal", "created", "last_updated", "semantic", "intelligence", "metadata"})
+
+if MSGSPEC_AVAILABLE:
+    class _SessionSummary(msgspec.Struct):
+        """Summary view of a session file; unknown keys such as the event log are skipped unparsed"""
+        id: Any = msgspec.UNSET
+        goal: Any = msgspec.UNSET
+        created: Any = msgspec.UNSET
+        last_updated: Any = msgspec.UNSET
+        semantic: Any = msgspec.UNSET
+        intelligence: Any = msgspec.UNSET
+        metadata: Any = msgspec.UNSET
+
+    _SESSION_SUMMARY_DECODER = msgspec.json.Decoder(_SessionSummary)
+
+    def _summary_fields(record: "_SessionSummary") -> Dict[str, Any]:
+        return {key: getattr(record, key) for key in _SUMMARY_FIELDS if getattr(record, key) is not msgspec.UNSET}
+
+# Importance multipliers per auto-captured context type
+_CONTEXT_MULTIPLIERS = {
+    "insight": 0.8,
+    "decision": 0.7,
+    "breakthrough": 0.9,
+    "obstacle": 0.6,
+    "solution": 0.8,
+    "pattern": 0.7,
+    "goal": 0.6
+}
+
+# Memory category for each auto-captured context type; anything else goes to "sessions"
+_MEMORY_CATEGORIES = {
+    "insight": "insights",
+    "decision": "decisions",
+    "breakthrough": "insights",
+    "obstacle": "solutions",
+    "solution": "solutions",
+    "pattern": "patterns",
+    "goal": "goals"
+}
+
+_TECH_INDICATORS = ('code', 'function', 'class', 'method', 'api', 'database', 'server', 'client')
+
+# Content-scanner groups besides the auto_memory_thresholds keyword groups
+_TECH_GROUP = "__tech__"
+_LEARNED_GROUP = "__learned__"
+
+# Event types that are always worth remembering / always auto-captured
+_HIGH_VALUE_TYPES = frozenset({"breakthrough", "major_decision", "critical_insight", "solution_found"})
+_AUTO_CAPTURE_TYPES = frozenset({"breakthrough", "major_insight", "critical_discovery",
+                                 "achievement", "milestone", "decision", "solution"})
+
+# Event type -> (episodic list it is also filed under, memory type it is always captured as,
+# session metadata added to the capture context); other types go through _should_auto_capture
+_BREAKTHROUGH = ("breakthroughs", "breakthrough", ("current_focus",))
+_OBSTACLE = ("obstacles", None, ())
+_ACHIEVEMENT = ("achievements", "achievement", ("energy_level",))
+_UNFILED = (None, None, ())
+_EVENT_DISPATCH = {
+    "breakthrough": _BREAKTHROUGH, "major_insight": _BREAKTHROUGH, "critical_discovery": _BREAKTHROUGH,
+    "obstacle": _OBSTACLE, "problem": _OBSTACLE, "error": _OBSTACLE, "blocker": _OBSTACLE,
+    "achievement": _ACHIEVEMENT, "milestone": _ACHIEVEMENT, "completion": _ACHIEVEMENT,
+}
+_EVENT_BUCKETS = {event_type: spec[0] for event_type, spec in _EVENT_DISPATCH.items()}
+_GENERIC_CAPTURE_CONTEXT = ("current_focus", "energy_level")
+
+# Journaled mutations between full snapshots of the current session
+_SNAPSHOT_EVERY = 50
+
+# Seconds to coalesce session/index writes before flushing them to disk
+_FLUSH_DELAY = 0.25
+
+# Parsed sessions kept by the _load_session LRU
+_SESSION_CACHE_SIZE = 32
+
+# Identical content auto-captured again within this many seconds is not stored twice
+_CAPTURE_DEDUP_SECONDS = 60
+_CAPTURE_DEDUP_SIZE = 256
+
+# Events kept inline in the session; older ones are spilled to {id}.events.jsonl
+_EVENT_WINDOW = 1000
+_EVENT_SPILL = 500
+
+
+def _require_session(fn: Callable[..., str]) -> Callable[..., str]:
+    """Guard a session mutator: require a current session and refresh it from disk first"""
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        if not self.current_session_id:
+            return "No active session. Start a session first with bb7_start_session."
+        self._load_current_session()
+        if not self.current_session:
+            return "Failed to load current session. Please start a new session."
+        return fn(self, *args, **kwargs)
+    return wrapper
+
+
+# Session timestamps are stored as integer epoch nanoseconds
+_now = time.time_ns
+
+
+def to_seconds(ts: float) -> float:
+    """Normalize a stored timestamp to epoch seconds; accepts legacy float seconds or integer nanoseconds"""
+    return ts / 1e9 if ts > 1e12 else ts
+
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_minute(minute: int, fmt: str) -> str:
+    return time.strftime(fmt, time.localtime(minute * 60))
+
+
+def _fmt_ts(ts: float, fmt: str = "%Y-%m-%d %H:%M") -> str:
+    """Format a timestamp at minute resolution, reusing strings for repeated minutes"""
+    return _fmt_minute(int(to_seconds(ts)) // 60, fmt)
+
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_second(second: int, fmt: str) -> str:
+    return time.strftime(fmt, time.localtime(second))
+
+
+def _fmt_ts_seconds(ts: float, fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
+    """Format a timestamp at second resolution, reusing strings for repeated seconds"""
+    return _fmt_second(int(to_seconds(ts)), fmt)
+
+
+@functools.lru_cache(maxsize=1024)
+def _concept_words(concept: str) -> frozenset:
+    """Lowercased word set of a concept name; concepts repeat across insights and relationships"""
+    return frozenset(concept.lower().split())
+
+
+def _op_workflow(session: Dict[str, Any], payload: Dict[str, Any]) -> None:
+    workflows = session.setdefault("procedural", {}).setdefault("workflows", [])
+    slot = payload.get("slot")
+    if slot is None or slot >= len(workflows):
+        workflows.append(payload["workflow"])
+    else:
+        workflows[slot] = payload["workflow"]
+
+
+def _op_focus(session: Dict[str, Any], payload: Dict[str, Any]) -> None:
+    session.setdefault("metadata", {}).update(payload)
+
+
+def _set_auto_captured(session: Dict[str, Any], payload: Dict[str, Any]) -> None:
+    # Absolute count, so applying an op twice (live then replay) is harmless
+    if "auto_captured" in payload:
+        session.setdefault("intelligence", {})["auto_captured_memories"] = payload["auto_captured"]
+
+
+def _op_event(session: Dict[str, Any], payload: Dict[str, Any]) -> None:
+    event = payload["event"]
+    episodic = session.setdefault("episodic", {})
+    bucket = _EVENT_BUCKETS.get(event["type"])
+    if bucket:
+        episodic.setdefault(bucket, []).append(event)
+    episodic.setdefault("events", []).append(event)
+    # Running per-type totals, spilled events included; absent on sessions that predate it
+    type_counts = episodic.get("type_counts")
+    if type_counts is not None:
+        type_counts[event["type"]] = type_counts.get(event["type"], 0) + 1
+    # The summary text lives on the event (same timestamp); the timeline only orders types
+    episodic.setdefault("timeline", []).append({"time": event["timestamp"], "event": event["type"]})
+    _set_auto_captured(session, payload)
+
+
+def _op_insight(session: Dict[str, Any], payload: Dict[str, Any]) -> None:
+    entry = payload["entry"]
+    concept, timestamp, insight = entry["concept"], entry["timestamp"], entry["insight"]
+    sem = session.setdefault("semantic", {})
+    concept_data = sem.setdefault("concepts", {}).setdefault(concept, {"insights": [], "importance_score": 0.5})
+    concept_data["insights"].append(entry)
+    concept_data["importance_score"] = min(1.0, concept_data["importance_score"] + 0.1)
+    concept_data.setdefault("evolution", []).append({
+        "timestamp": timestamp,
+        "type": "insight_added",
+        "content": insight
+    })
+    for relationship in payload.get("relationships", []):
+        sem.setdefault("relationships", []).append(relationship)
+        sem.setdefault("knowledge_connections", []).append({
+            "concepts": [concept, relationship["to"]],
+            "connection_type": "insight_based",
+            "evidence": insight,
+            "timestamp": timestamp
+        })
+    sem.setdefault("key_insights", []).append({
+        "timestamp": timestamp,
+        "insight": insight,
+        "concept": concept
+    })
+    _set_auto_captured(session, payload)
+
+
+def _op_spill(session: Dict[str, Any], payload: Dict[str, Any]) -> None:
+    # The oldest events are in the events shard up to the given byte length; drop them inline
+    episodic = session.setdefault("episodic", {})
+    del episodic.setdefault("events", [])[:payload["count"]]
+    episodic["spilled_events"] = payload["spilled"]
+    episodic["spilled_bytes"] = payload["bytes"]
+
+
+# Journal op name -> in-place mutation; shared by live updates and replay
+_SESSION_OPS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], None]] = {
+    "workflow": _op_workflow,
+    "focus": _op_focus,
+    "event": _op_event,
+    "insight": _op_insight,
+    "spill": _op_spill,
+}
+
+
+def _apply_journal(journal: Path, session: Dict[str, Any]) -> int:
+    """Apply journaled ops newer than the snapshot; returns the number applied"""
+    try:
+        with open(journal, 'rb') as fh:
+            lines = fh.readlines()
+    except FileNotFoundError:
+        return 0
+    applied = 0
+    snapshot_seq = session.get("journal_seq", 0)
+    for line in lines:
+        try:
+            entry = _decode_json(line)
+        except ValueError:
+            continue  # torn trailing write
+        if entry["seq"] <= snapshot_seq or entry["op"] not in _SESSION_OPS:
+            continue
+        _SESSION_OPS[entry["op"]](session, entry["p"])
+        session["last_updated"] = entry["t"]
+        session["journal_seq"] = entry["seq"]
+        applied += 1
+    return applied
+
+
+def read_session(snapshot: Path) -> Any:
+    """Read a session snapshot ({id}.json or {id}.json.zst) with its pending journal replayed"""
+    session = _read_json(snapshot)
+    if isinstance(session, dict):
+        name = snapshot.name
+        session_id = name[:-9] if name.endswith('.json.zst') else name[:-5]
+        _apply_journal(snapshot.parent / f"{session_id}.journal.jsonl", session)
+    return session
+
+
+# Words counted when looking for recurring obstacle terms
+_WORD_RE = re.compile(r"[a-zA-Z_]{3,}")
+_STOPWORDS = frozenset({"the", "and", "for", "with", "from", "this", "that", "have", "has", "had",
+                        "into", "onto", "when", "then", "else"})
+
+# Single-pass scan for causal wording in insights
+_SPECIFICITY_RE = re.compile(r"because|therefore|thus|hence|due to", re.IGNORECASE)
+
+# Static tool metadata; get_tools() only binds the callables per instance
+_TOOL_METADATA: Dict[str, Dict[str, Any]] = {
+    'bb7_start_session': {
+        "name": "bb7_start_session",
+        "description": "🎯 Begin a new cognitive development session with goal tracking, episodic memory, and workflow recording. Use when starting significant work, tackling new problems, or beginning focused development sessions. Creates structured memory for complex tasks.",
+        "category": "sessions",
+        "priority": "high",
+        "when_to_use": ["new_project", "complex_task", "development_session", "focused_work"],
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "goal": { "type": "string", "description": "Clear objective for this session" },
+                "context": { "type": "string", "description": "Background context or current situation" },
+                "tags": { "type": "array", "items": {"type": "string"}, "description": "Categorization tags for the session" }
+            },
+            "required": ["goal"]
+        }
+    },
+    'bb7_log_event': {
+        "name": "bb7_log_event",
+        "description": "📝 Record significant events, decisions, discoveries, or problems in the current session timeline. Use to build episodic memory of development process, track decision rationale, and create searchable development history.",
+        "category": "sessions",
+        "priority": "medium",
+        "when_to_use": ["important_events", "decisions", "discoveries", "problems", "milestones"],
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "event_type": { "type": "string", "description": "Type: 'decision', 'discovery', 'problem', 'solution', 'insight'" },
+                "description": { "type": "string", "description": "What happened and why it's significant" },
+                "details": { "type": "object", "description": "Additional structured information" }
+            },
+            "required": ["event_type", "description"]
+        }
+    },
+    'bb7_capture_insight': {
+        "name": "bb7_capture_insight",
+        "description": "💡 Record semantic insights, architectural understanding, or conceptual breakthroughs. Use when you or the user gain important understanding about the codebase, design patterns, or problem domain. Builds conceptual knowledge base.",
+        "category": "sessions",
+        "priority": "high",
+        "when_to_use": ["insight_recording", "architecture", "design_patterns", "conceptual_breakthrough"],
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "insight": { "type": "string" },
+                "concept": { "type": "string" },
+                "relationships": { "type": "array", "items": {"type": "string"} }
+            },
+            "required": ["insight", "concept"]
+        }
+    },
+    'bb7_get_session_insights': {
+        "name": "bb7_get_session_insights",
+        "description": "Generate a session intelligence report, highlighting key insights, breakthroughs, and cognitive metrics.",
+        "category": "sessions",
+        "priority": "medium",
+        "when_to_use": ["session_reporting", "cognitive_metrics", "insight_generation"],
+        "input_schema": {"type": "object", "properties": {"session_id": {"type": "string"}}, "required": []}
+    },
+    'bb7_cross_session_analysis': {
+        "name": "bb7_cross_session_analysis",
+        "description": "Analyze patterns, goals, and outcomes across multiple sessions. Use for longitudinal insights and workflow optimization.",
+        "category": "sessions",
+        "priority": "medium",
+        "when_to_use": ["longitudinal_analysis", "workflow_optimization", "session_patterns"],
+        "input_schema": {"type": "object", "properties": {"days_back": {"type": "integer", "default": 30}}, "required": []}
+    },
+    'bb7_session_recommendations': {
+        "name": "bb7_session_recommendations",
+        "description": "Provide recommendations for next actions or improvements based on session history and patterns.",
+        "category": "sessions",
+        "priority": "medium",
+        "when_to_use": ["action_recommendations", "workflow_improvement", "session_guidance"],
+        "input_schema": {"type": "object", "properties": {"goal": {"type": "string"}}, "required": ["goal"]}
+    },
+    'bb7_record_workflow': {
+        "name": "bb7_record_workflow",
+        "description": "⚙️ Document successful workflows, processes, or step-by-step procedures for future reuse. Use when you discover effective approaches, solve complex problems, or establish repeatable processes. Builds procedural knowledge.",
+        "category": "sessions",
+        "priority": "medium",
+        "when_to_use": ["successful_workflows", "processes", "procedures", "solutions", "patterns"],
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "workflow_name": { "type": "string", "description": "Descriptive name for the workflow" },
+                "steps": { "type": "array", "items": {"type": "string"}, "description": "Ordered list of steps" },
+                "context": { "type": "string", "description": "When and how to use this workflow" }
+            },
+            "required": ["workflow_name", "steps"]
+        }
+    },
+    'bb7_update_focus': {
+        "name": "bb7_update_focus",
+        "description": "🎯 Update current attention focus and energy state. Use when switching contexts, changing priorities, or when user's focus shifts. Helps maintain awareness of current cognitive state and priorities.",
+        "category": "sessions",
+        "priority": "low",
+        "when_to_use": ["context_switch", "priority_change", "focus_shift", "energy_tracking"],
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "focus_areas": { "type": "array", "items": {"type": "string"}, "description": "Current areas of focus and attention" },
+                "energy_level": { "type": "string", "enum": ["low", "medium", "high"], "default": "medium" },
+                "momentum": { "type": "string", "enum": ["starting", "building", "flowing", "slowing"], "default": "steady" }
+            },
+            "required": ["focus_areas"]
+        }
+    },
+    'bb7_pause_session': {
+        "name": "bb7_pause_session",
+        "description": "Pause the current session",
+        "category": "sessions",
+        "priority": "low",
+        "when_to_use": ["pause_work", "interrupt_session"],
+        "input_schema": {
+            "type": "object",
+            "properties": { "reason": { "type": "string", "description": "Reason for pausing" } },
+            "required": []
+        }
+    },
+    'bb7_resume_session': {
+        "name": "bb7_resume_session",
+        "description": "Resume a paused session",
+        "category": "sessions",
+        "priority": "low",
+        "when_to_use": ["resume_work", "continue_session"],
+        "input_schema": {
+            "type": "object",
+            "properties": { "session_id": { "type": "string", "description": "ID of session to resume" } },
+            "required": ["session_id"]
+        }
+    },
+    'bb7_list_sessions': {
+        "name": "bb7_list_sessions",
+        "description": "List all sessions with optional status filter",
+        "category": "sessions",
+        "priority": "low",
+        "when_to_use": ["session_overview", "find_session"],
+        "input_schema": {
+            "type": "object",
+            "properties": { "status": { "type": "string", "description": "Filter by status (e.g., 'active', 'paused', 'completed')" }, "limit": { "type": "integer", "description": "Maximum number of sessions to return" } },
+            "required": []
+        }
+    },
+    'bb7_get_session_summary': {
+        "name": "bb7_get_session_summary",
+        "description": "Get a detailed summary of a specific session",
+        "category": "sessions",
+        "priority": "low",
+        "when_to_use": ["session_details", "review_session"],
+        "input_schema": {
+            "type": "object",
+            "properties": { "session_id": { "type": "string", "description": "ID of session to summarize" } },
+            "required": ["session_id"]
+        }
+    },
+    'bb7_export_session_json': {
+        "name": "bb7_export_session_json",
+        "description": "Export a complete session, including spilled events, as human-readable JSON",
+        "category": "sessions",
+        "priority": "low",
+        "when_to_use": ["export_session", "inspect_session_data"],
+        "input_schema": {
+            "type": "object",
+            "properties": { "session_id": { "type": "string", "description": "ID of session to export" } },
+            "required": ["session_id"]
+        }
+    },
+    'bb7_learned_patterns': {
+        "name": "bb7_learned_patterns",
+        "description": "Summarize recurring patterns, solutions, and best practices learned from past sessions and memories.",
+        "category": "sessions",
+        "priority": "medium",
+        "when_to_use": ["pattern_recognition", "best_practices", "solution_summarization"],
+        "input_schema": {"type": "object", "properties": {}, "required": []}
+    },
+    'bb7_session_intelligence': {
+        "name": "bb7_session_intelligence",
+        "description": "Show raw intelligence metrics learned across sessions.",
+        "category": "sessions",
+        "priority": "low",
+        "when_to_use": ["metrics", "debug"],
+        "input_schema": {"type": "object", "properties": {}, "required": []}
+    },
+    'bb7_link_memory_to_session': {
+        "name": "bb7_link_memory_to_session",
+        "description": "Link a memory key to the current session",
+        "category": "sessions",
+        "priority": "low",
+        "when_to_use": ["memory_linking"],
+        "input_schema": {
+            "type": "object",
+            "properties": { "memory_key": { "type": "string", "description": "Memory key to link" } },
+            "required": ["memory_key"]
+        }
+    },
+    'bb7_auto_memory_stats': {
+        "name": "bb7_auto_memory_stats",
+        "description": "Automatically compute and report memory usage statistics, trends, and optimization suggestions.",
+        "category": "memory",
+        "priority": "low",
+        "when_to_use": ["memory_management", "resource_optimization", "usage_analysis"],
+        "input_schema": {"type": "object", "properties": {}, "required": []}
+    }
+}
+
 class EnhancedSessionTool:
     """Enhanced cognitive session management with automatic memory formation"""
     
@@ -44,11 +620,49 @@ class EnhancedSessionTool:
         self.index_file = self.sessions_dir / "session_index.json"
         self.patterns_file = self.sessions_dir / "learned_patterns.json"
         self.intelligence_file = self.sessions_dir / "session_intelligence.json"
+        self.memory_index_file = self.sessions_dir / "memory_index.json"
+        self.summaries_dir = self.sessions_dir / "summaries"
+        self.summaries_dir.mkdir(exist_ok=True)
+        # Indent persisted JSON for hand inspection; compact by default
+        self._pretty_print = False
+        # zstd-compress large session snapshots when zstandard is installed
+        self._compress = True
         
         # Current session state
         self.current_session_id = None
         self.current_session = None
-        self._lock = threading.Lock()
+        self._session_mtime_ns = None
+        self._workflow_index: Dict[str, int] = {}
+        # _lock guards in-memory state; _write_lock only orders disk writes so
+        # serialized snapshots can be written without blocking mutators
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._write_gen = 0
+        self._written_gen: Dict[str, int] = {}
+        
+        # Append-only journal of mutations since the last full snapshot
+        self._journal_fp = None
+        self._journal_seq = 0
+        self._journal_pending = 0
+        
+        # Parsed session index, reused until the file's mtime changes
+        self._index_cache: Optional[Dict[str, Any]] = None
+        self._index_mtime_ns: Optional[int] = None
+        # Secondary views of _index_cache: newest-first (-created, id) list, overall and per status
+        self._index_views: Optional[Tuple[List[Tuple[float, str]], Dict[str, List[Tuple[float, str]]]]] = None
+        self._index_views_for: Optional[Dict[str, Any]] = None
+        # Recently parsed non-current sessions, keyed by id -> (file stamp, session); read-only
+        self._session_cache: "OrderedDict[str, Tuple[Tuple[Any, ...], Dict[str, Any]]]" = OrderedDict()
+        self._session_cache_lock = threading.Lock()
+        # (sessions_dir mtime, ids with a snapshot) from the last directory listing
+        self._session_listing: Optional[Tuple[int, Dict[str, os.DirEntry]]] = None
+        self._memory_index_cache: Optional[Dict[str, Any]] = None
+        self._memory_index_mtime_ns: Optional[int] = None
+        
+        # Targets ("session", "index", "memory_index", "patterns", "intelligence") with
+        # unflushed changes, written by a debounce timer
+        self._dirty = set()
+        self._flush_timer: Optional[threading.Timer] = None
         
         # Auto-memory formation settings
         self.auto_memory_thresholds = {
@@ -59,18 +673,39 @@ class EnhancedSessionTool:
             "pattern_keywords": ["pattern", "always", "typically", "usually", "consistently"]
         }
         
-        # Load learned patterns
-        self.learned_patterns = self._load_learned_patterns()
-        self.session_intelligence = self._load_session_intelligence()
+        # Auto-captured memories are stored by a background worker, deduplicated by content hash
+        self._memory_queue: "queue.SimpleQueue[Optional[Tuple[Any, ...]]]" = queue.SimpleQueue()
+        self._memory_worker: Optional[threading.Thread] = None
+        self._recent_captures: "OrderedDict[str, float]" = OrderedDict()
+        
+        # learned_patterns / session_intelligence load on first use; the keyword
+        # scanner is built by the first _keyword_hits call
+        self._scanned_accelerators = None
+        
+        # get_tools() result; metadata is static and the callables are bound once
+        self._tools: Optional[Dict[str, Dict[str, Any]]] = None
+        
+        # Rendered bb7_learned_patterns / bb7_session_intelligence output, dropped when the data is saved
+        self._rendered_json: Dict[str, str] = {}
+        
+        # Per-instance memo of serialized recommendations, cleared when session history changes
+        self._recommendations_cache = functools.lru_cache(maxsize=128)(self._recommendations_json)
         
         self.logger.info("Enhanced session manager initialized with auto-memory formation")
     
+    @functools.cached_property
+    def learned_patterns(self) -> Dict[str, Any]:
+        return self._load_learned_patterns()
+
+    @functools.cached_property
+    def session_intelligence(self) -> Dict[str, Any]:
+        return self._load_session_intelligence()
+
     def _load_learned_patterns(self) -> Dict[str, Any]:
         """Load previously learned patterns from sessions"""
         try:
             if self.patterns_file.exists():
-                with open(self.patterns_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return _read_json(self.patterns_file)
         except Exception as e:
             self.logger.error(f"Failed to load learned patterns: {e}")
         
@@ -82,20 +717,48 @@ class EnhancedSessionTool:
             "learning_accelerators": []
         }
     
+    def _keyword_groups(self) -> List[Tuple[str, Any]]:
+        """Every (group, keywords) pair the content scanner looks for"""
+        accelerators = [p.lower() for p in self.learned_patterns.get("learning_accelerators", [])
+                        if isinstance(p, str) and p]
+        return [*self.auto_memory_thresholds.items(), (_TECH_GROUP, _TECH_INDICATORS), (_LEARNED_GROUP, accelerators)]
+
+    def _build_keyword_scanner(self) -> None:
+        """Compile all keyword groups into one Aho-Corasick automaton, or a flat keyword table without pyahocorasick"""
+        self._scanned_accelerators = list(self.learned_patterns.get("learning_accelerators", []))
+        entries = defaultdict(list)
+        for group, keywords in self._keyword_groups():
+            for keyword in keywords:
+                entries[keyword.lower()].append((group, keyword.lower()))
+        # Substring checks run in C and beat a regex alternation on these short keyword lists
+        self._keyword_table = tuple((keyword, tuple(hits)) for keyword, hits in entries.items())
+        self._keyword_automaton = None
+        if not AHOCORASICK_AVAILABLE:
+            return
+        automaton = ahocorasick.Automaton()
+        for keyword, hits in entries.items():
+            automaton.add_word(keyword, tuple(hits))
+        automaton.make_automaton()
+        self._keyword_automaton = automaton
+
+    def _keyword_hits(self, content_lower: str) -> set:
+        """Distinct (group, keyword) pairs whose keyword occurs in the lowercased text"""
+        if self.learned_patterns.get("learning_accelerators", []) != self._scanned_accelerators:
+            self._build_keyword_scanner()
+        if self._keyword_automaton is not None:
+            return {hit for _, hits in self._keyword_automaton.iter(content_lower) for hit in hits}
+        return {hit for keyword, hits in self._keyword_table if keyword in content_lower for hit in hits}
+
     def _save_learned_patterns(self):
-        """Save learned patterns to disk"""
-        try:
-            with open(self.patterns_file, 'w', encoding='utf-8') as f:
-                json.dump(self.learned_patterns, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            self.logger.error(f"Failed to save learned patterns: {e}")
+        """Schedule learned patterns for the next debounced flush"""
+        self._rendered_json.pop("patterns", None)
+        self._mark_dirty("patterns")
     
     def _load_session_intelligence(self) -> Dict[str, Any]:
         """Load session intelligence data"""
         try:
             if self.intelligence_file.exists():
-                with open(self.intelligence_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return _read_json(self.intelligence_file)
         except Exception as e:
             self.logger.error(f"Failed to load session intelligence: {e}")
         
@@ -108,46 +771,37 @@ class EnhancedSessionTool:
         }
     
     def _save_session_intelligence(self):
-        """Save session intelligence data"""
-        try:
-            with open(self.intelligence_file, 'w', encoding='utf-8') as f:
-                json.dump(self.session_intelligence, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            self.logger.error(f"Failed to save session intelligence: {e}")
+        """Schedule session intelligence for the next debounced flush"""
+        self._rendered_json.pop("intelligence", None)
+        self._mark_dirty("intelligence")
     
     def _calculate_content_importance(self, content: str, context_type: str) -> float:
         """Calculate importance score for content based on various factors"""
         importance = 0.5  # Base importance
-        content_lower = content.lower()
         
         # Context type multipliers
-        context_multipliers = {
-            "insight": 0.8,
-            "decision": 0.7,
-            "breakthrough": 0.9,
-            "obstacle": 0.6,
-            "solution": 0.8,
-            "pattern": 0.7,
-            "goal": 0.6
-        }
+        importance *= _CONTEXT_MULTIPLIERS.get(context_type, 1.0)
+        if not content:
+            return min(importance, 1.0)
         
-        importance *= context_multipliers.get(context_type, 1.0)
+        # Distinct keyword hits per group, from one scan of the text
+        hit_counts = Counter(group for group, _ in self._keyword_hits(content.lower()))
         
         # Keyword-based importance boosts
-        for keyword_type, keywords in self.auto_memory_thresholds.items():
-            hit_count = sum(1 for k in keywords if k in content_lower)
+        for keyword_type in self.auto_memory_thresholds:
+            hit_count = hit_counts.get(keyword_type, 0)
             if hit_count:
                 importance += min(0.1 * hit_count, 0.3)
         
         # Length and complexity factors
-        if len(content) > 100:
+        length = len(content)
+        if length > 100:
             importance += 0.1
-        if len(content) > 500:
+        if length > 500:
             importance += 0.2
         
         # Technical content indicators
-        tech_indicators = ['code', 'function', 'class', 'method', 'api', 'database', 'server', 'client']
-        tech_matches = sum(1 for indicator in tech_indicators if indicator in content_lower)
+        tech_matches = hit_counts.get(_TECH_GROUP, 0)
         if tech_matches > 0:
             importance += min(0.05 * tech_matches, 0.2)
         
@@ -161,19 +815,12 @@ class EnhancedSessionTool:
         content_lower = content.lower()
         
         # Always capture high-value event types
-        high_value_types = ["breakthrough", "major_decision", "critical_insight", "solution_found"]
-        if event_type in high_value_types:
+        if event_type in _HIGH_VALUE_TYPES:
             return True
         
-        # Check for important keywords
-        for keyword_type, keywords in self.auto_memory_thresholds.items():
-            if any(k in content_lower for k in keywords):
-                return True
-        
-        # Check for patterns we've learned are important
-        for pattern in self.learned_patterns.get("learning_accelerators", []):
-            if isinstance(pattern, str) and pattern.lower() in content_lower:
-                return True
+        # Check for important keywords and patterns we've learned are important
+        if any(group != _TECH_GROUP for group, _ in self._keyword_hits(content_lower)):
+            return True
         
         # Length-based importance (longer descriptions often more important)
         if len(content) > 200:
@@ -181,32 +828,26 @@ class EnhancedSessionTool:
         
         return False
     
-    def _auto_capture_memory(self, event_type: str, content: str, additional_context: Optional[Dict[str, Any]] = None):
-        """Automatically create memory entries for significant events"""
+    def _auto_capture_memory(self, event_type: str, content: str, additional_context: Optional[Dict[str, Any]] = None) -> bool:
+        """Automatically create memory entries for significant events; True if a store was queued"""
         if not self.memory_tool or not self._is_memory_worthy(event_type, content):
-            return
+            return False
         
         try:
             # Generate intelligent memory key
             session_prefix = f"session_{self.current_session_id[:8]}" if self.current_session_id else "global"
-            timestamp = int(time.time())
-            content_hash = hashlib.md5(content.encode()).hexdigest()[:8]
+            now = time.time()
+            timestamp = int(now)
+            content_hash = _content_digest(content.encode())[:8]
             memory_key = f"{session_prefix}_{event_type}_{timestamp}_{content_hash}"
+            if not self._first_capture(f"{session_prefix}_{content_hash}", now):
+                return False
             
             # Calculate importance
             importance = self._calculate_content_importance(content, event_type)
             
             # Determine category
-            category_mapping = {
-                "insight": "insights",
-                "decision": "decisions", 
-                "breakthrough": "insights",
-                "obstacle": "solutions",
-                "solution": "solutions",
-                "pattern": "patterns",
-                "goal": "goals"
-            }
-            category = category_mapping.get(event_type, "sessions")
+            category = _MEMORY_CATEGORIES.get(event_type, "sessions")
             
             # Generate smart tags
             tags = [event_type, "auto_generated"]
@@ -229,20 +870,13 @@ class EnhancedSessionTool:
                 if additional_context.get("current_focus"):
                     context_info.append(f"Focus: {', '.join(additional_context['current_focus'])}")
                 if additional_context.get("timestamp"):
-                    dt = datetime.fromtimestamp(additional_context['timestamp'])
-                    context_info.append(f"Time: {dt.strftime('%Y-%m-%d %H:%M:%S')}")
+                    context_info.append(f"Time: {_fmt_ts_seconds(additional_context['timestamp'])}")
                 
                 if context_info:
                     enhanced_content += f"\n\nContext: {' | '.join(context_info)}"
             
-            # Store in enhanced memory
-            result = self.memory_tool.store(
-                memory_key,
-                enhanced_content,
-                category=category,
-                importance=importance,
-                tags=tags
-            )
+            # Store in enhanced memory off the event path
+            self._enqueue_memory_store(memory_key, enhanced_content, category, importance, tags)
             
             # Update intelligence counters
             if self.current_session:
@@ -250,10 +884,49 @@ class EnhancedSessionTool:
                 intel["auto_captured_memories"] = intel.get("auto_captured_memories", 0) + 1
             
             self.logger.info(f"Auto-captured memory: {memory_key} (importance: {importance:.2f})")
+            return True
             
         except Exception as e:
             self.logger.error(f"Failed to auto-capture memory: {e}")
+            return False
     
+    def _first_capture(self, fingerprint: str, now: float) -> bool:
+        """Record a capture fingerprint; False if the same content was captured within the dedup window"""
+        recent = self._recent_captures
+        seen = recent.get(fingerprint)
+        recent[fingerprint] = now
+        recent.move_to_end(fingerprint)
+        while len(recent) > _CAPTURE_DEDUP_SIZE:
+            recent.popitem(last=False)
+        return seen is None or now - seen > _CAPTURE_DEDUP_SECONDS
+
+    def _enqueue_memory_store(self, *args: Any) -> None:
+        self._memory_queue.put(args)
+        if self._memory_worker is None:
+            self._memory_worker = threading.Thread(target=self._memory_store_loop, daemon=True)
+            self._memory_worker.start()
+
+    def _memory_store_loop(self) -> None:
+        """Drain queued memory stores until a None sentinel arrives"""
+        while True:
+            item = self._memory_queue.get()
+            if item is None:
+                return
+            memory_key, content, category, importance, tags = item
+            try:
+                self.memory_tool.store(memory_key, content, category=category, importance=importance, tags=tags)
+            except Exception as e:
+                self.logger.error(f"Failed to store auto-captured memory {memory_key}: {e}")
+
+    def _drain_memory_queue(self) -> None:
+        """Wait for every queued memory store to finish"""
+        worker = self._memory_worker
+        if worker is None:
+            return
+        self._memory_worker = None
+        self._memory_queue.put(None)
+        worker.join()
+
     def _analyze_session_patterns(self, session: Dict[str, Any]):
         """Analyze session for patterns and learning opportunities"""
         try:
@@ -266,15 +939,14 @@ class EnhancedSessionTool:
             if problem_events:
                 common_terms = Counter()
                 for e in problem_events:
-                    for w in re.findall(r"[a-zA-Z_]{3,}", e.get("description", "").lower()):
-                        if w not in {"the","and","for","with","from","this","that","have","has","had","into","onto","when","then","else"}:
-                            common_terms[w] += 1
+                    common_terms.update(w for w in _WORD_RE.findall(e.get("description", "").lower())
+                                        if w not in _STOPWORDS)
                 common_top = [w for w,_ in common_terms.most_common(5)]
                 if common_top:
                     self.learned_patterns.setdefault("common_obstacles", []).append({
                         "terms": common_top,
                         "session": session.get("id"),
-                        "timestamp": time.time()
+                        "timestamp": _now()
                     })
                     self._save_learned_patterns()
         
@@ -284,21 +956,25 @@ class EnhancedSessionTool:
     def _extract_energy_progression(self, events: List[Dict[str, Any]]) -> List[str]:
         """Extract energy level progression from events"""
         energy_levels = []
+        append = energy_levels.append
         for event in events:
-            details = event.get("details", {})
+            details = event.get("details")
+            # Most events are logged without details
+            if not details:
+                continue
             energy = details.get("energy_level") or details.get("energy")
             if isinstance(energy, str):
-                energy_levels.append(energy)
+                append(energy)
         return energy_levels
     
     def bb7_start_session(self, goal: str, context: Optional[str] = None, 
                          tags: Optional[List[str]] = None) -> str:
         """Start a new enhanced cognitive session with intelligence"""
         with self._lock:
+            self._compact_journal()
             session_id = str(uuid.uuid4())
-            now = time.time()
-            self.current_session_id = session_id
-            self.current_session = {
+            now = _now()
+            session = {
                 "id": session_id,
                 "goal": goal,
                 "context": context or "",
@@ -306,13 +982,6 @@ class EnhancedSessionTool:
                 "created": now,
                 "last_updated": now,
                 "status": "active",
-                "episodic": {
-                    "events": [],
-                    "timeline": [],
-                    "breakthroughs": [],
-                    "obstacles": [],
-                    "achievements": []
-                },
                 "semantic": {
                     "concepts": {},
                     "key_insights": [],
@@ -329,22 +998,35 @@ class EnhancedSessionTool:
                 },
                 "intelligence": {
                     "auto_captured_memories": 0
+                },
+                # Kept last so summary readers can stop before the event log
+                "episodic": {
+                    "events": [],
+                    "type_counts": {},
+                    "timeline": [],
+                    "breakthroughs": [],
+                    "obstacles": [],
+                    "achievements": []
                 }
             }
-            # Persist
-            self._save_current_session()
+            self._activate_session(session_id, session)
             index = self._load_index()
-            index[session_id] = {
+            self._add_index_entry(index, session_id, {
                 "goal": goal,
                 "created": now,
+                "last_updated": now,
                 "status": "active",
                 "tags": tags or []
-            }
+            })
             self._save_index(index)
-            
-            # Recommend initial actions
-            recs = self._generate_session_recommendations(goal)
-            return f"🎯 Started session {session_id[:8]}: {goal}\nSuggested duration: {recs.get('optimal_duration',60)} min"
+            self._dirty.add("session")
+            writes = self._collect_writes()
+        # Persist
+        self._commit_writes(writes)
+        
+        # Recommend initial actions
+        recs = self._generate_session_recommendations(goal)
+        return f"🎯 Started session {session_id[:8]}: {goal}\nSuggested duration: {recs.get('optimal_duration',60)} min"
     
     def _generate_session_recommendations(self, goal: str) -> Dict[str, Any]:
         """Generate intelligent recommendations based on past sessions"""
@@ -361,13 +1043,15 @@ class EnhancedSessionTool:
             # naive optimal duration based on recent successful sessions lengths
             durations = []
             for sid in list(index.keys())[-10:]:
-                f = self.sessions_dir / f"{sid}.json"
-                if f.exists():
-                    with open(f, 'r', encoding='utf-8') as fh:
-                        s = json.load(fh)
-                        dur = max(0, s.get("last_updated", s.get("created", 0)) - s.get("created", 0))
-                        if dur:
-                            durations.append(dur)
+                meta = index[sid]
+                if "last_updated" not in meta:
+                    # Index rows written before the column existed
+                    if not self._session_exists(sid):
+                        continue
+                    meta = self._load_session(sid)
+                dur = max(0, to_seconds(meta.get("last_updated", meta.get("created", 0))) - to_seconds(meta.get("created", 0)))
+                if dur:
+                    durations.append(dur)
             if durations:
                 avg = sum(durations)/len(durations)
                 recommendations["optimal_duration"] = max(30, int(avg/60))
@@ -376,20 +1060,20 @@ class EnhancedSessionTool:
         
         return recommendations
     
+    def _recommendations_json(self, goal: str) -> str:
+        """Serialize recommendations for a goal (memoized per instance)"""
+        return json.dumps(self._generate_session_recommendations(goal), indent=2)
+    
+    def bb7_session_recommendations(self, goal: str) -> str:
+        """Provide recommendations for a goal based on session history"""
+        return self._recommendations_cache(goal)
+    
+    @_require_session
     def bb7_log_event(self, event_type: str, description: str, 
                      details: Optional[Dict[str, Any]] = None) -> str:
         """Enhanced event logging with auto-memory formation"""
-        if not self.current_session_id:
-            return "No active session. Start a session first with bb7_start_session."
-        
-        # Ensure current session is loaded
-        if not self.current_session:
-            self._load_current_session()
-            if not self.current_session:
-                return "Failed to load current session. Please start a new session."
-        
         with self._lock:
-            timestamp = time.time()
+            timestamp = _now()
             event = {
                 "timestamp": timestamp,
                 "type": event_type,
@@ -397,58 +1081,25 @@ class EnhancedSessionTool:
                 "details": details or {},
                 "auto_analyzed": False
             }
-            # Categorization
-            if event_type in ["breakthrough", "major_insight", "critical_discovery"]:
-                self.current_session["episodic"]["breakthroughs"].append(event)
-                self._auto_capture_memory(
-                    "breakthrough",
-                    description,
-                    {
-                        "session_goal": self.current_session.get("goal"),
-                        "current_focus": self.current_session.get("metadata", {}).get("attention_focus", []),
-                        "timestamp": timestamp
-                    }
-                )
-                event["auto_analyzed"] = True
-            elif event_type in ["obstacle", "problem", "error", "blocker"]:
-                self.current_session["episodic"]["obstacles"].append(event)
-            elif event_type in ["achievement", "milestone", "completion"]:
-                self.current_session["episodic"]["achievements"].append(event)
-                self._auto_capture_memory(
-                    "achievement",
-                    description,
-                    {
-                        "session_goal": self.current_session.get("goal"),
-                        "energy_level": self.current_session.get("metadata", {}).get("energy_level"),
-                        "timestamp": timestamp
-                    }
-                )
-                event["auto_analyzed"] = True
+            # One dispatch lookup decides the single auto-capture for this event
+            capture_type, context_keys = _EVENT_DISPATCH.get(event_type, _UNFILED)[1:]
+            if capture_type is None and self._should_auto_capture(event_type, description):
+                capture_type, context_keys = event_type, _GENERIC_CAPTURE_CONTEXT
+            if capture_type:
+                metadata = self.current_session.get("metadata", {})
+                context = {"session_goal": self.current_session.get("goal"), "timestamp": timestamp}
+                if "current_focus" in context_keys:
+                    context["current_focus"] = metadata.get("attention_focus", [])
+                if "energy_level" in context_keys:
+                    context["energy_level"] = metadata.get("energy_level")
+                event["auto_analyzed"] = self._auto_capture_memory(capture_type, description, context)
             
-            # Add to main logs
-            self.current_session["episodic"]["events"].append(event)
-            self.current_session["episodic"]["timeline"].append({
-                "time": timestamp,
-                "event": event_type,
-                "summary": description[:100]
-            })
-            
-            # Intelligent capture
-            if self._should_auto_capture(event_type, description):
-                self._auto_capture_memory(
-                    event_type,
-                    description,
-                    {
-                        "session_goal": self.current_session.get("goal"),
-                        "current_focus": self.current_session.get("metadata", {}).get("attention_focus", []),
-                        "energy_level": self.current_session.get("metadata", {}).get("energy_level"),
-                        "timestamp": timestamp
-                    }
-                )
-                event["auto_analyzed"] = True
-            
-            self.current_session["last_updated"] = timestamp
-            self._save_current_session()
+            # Journal the event instead of rewriting the whole session
+            payload = {"event": event}
+            if event["auto_analyzed"]:
+                payload["auto_captured"] = self.current_session.get("intelligence", {}).get("auto_captured_memories", 0)
+            self._record("event", payload)
+            self._spill_events()
             
             response = f"📝 Event logged: {description}"
             if event["auto_analyzed"]:
@@ -461,27 +1112,18 @@ class EnhancedSessionTool:
     def _should_auto_capture(self, event_type: str, description: str) -> bool:
         """Enhanced logic for determining auto-capture worthiness"""
         # Always capture certain event types
-        auto_capture_types = ["breakthrough", "major_insight", "critical_discovery", 
-                             "achievement", "milestone", "decision", "solution"]
-        if event_type in auto_capture_types:
+        if event_type in _AUTO_CAPTURE_TYPES:
             return True
         
         # Use existing memory worthiness logic
         return self._is_memory_worthy(event_type, description)
     
+    @_require_session
     def bb7_capture_insight(self, insight: str, concept: str, 
                            relationships: Optional[List[str]] = None) -> str:
         """Enhanced insight capture with auto-memory and relationship tracking"""
-        if not self.current_session_id:
-            return "No active session. Start a session first with bb7_start_session."
-        
-        if not self.current_session:
-            self._load_current_session()
-            if not self.current_session:
-                return "Failed to load current session. Please start a new session."
-        
         with self._lock:
-            timestamp = time.time()
+            timestamp = _now()
             
             # Enhanced semantic memory storage
             insight_entry = {
@@ -496,64 +1138,39 @@ class EnhancedSessionTool:
                 }
             }
             
-            # Update semantic structures
-            sem = self.current_session.setdefault("semantic", {})
-            concepts = sem.setdefault("concepts", {})
-            concept_data = concepts.setdefault(concept, {"insights": [], "importance_score": 0.5})
-            concept_data["insights"].append(insight_entry)
-            concept_data["importance_score"] = min(1.0, concept_data["importance_score"] + 0.1)
-            concept_data.setdefault("evolution", []).append({
-                "timestamp": timestamp,
-                "type": "insight_added",
-                "content": insight
-            })
-            
-            # Relationships
-            if relationships:
-                for related_concept in relationships:
-                    relationship = {
-                        "from": concept,
-                        "to": related_concept,
-                        "timestamp": timestamp,
-                        "context": insight,
-                        "strength": self._calculate_relationship_strength(concept, related_concept, insight)
-                    }
-                    sem.setdefault("relationships", []).append(relationship)
-                    sem.setdefault("knowledge_connections", []).append({
-                        "concepts": [concept, related_concept],
-                        "connection_type": "insight_based",
-                        "evidence": insight,
-                        "timestamp": timestamp
-                    })
+            relationships_made = [
+                {
+                    "from": concept,
+                    "to": related_concept,
+                    "timestamp": timestamp,
+                    "context": insight,
+                    "strength": self._calculate_relationship_strength(concept, related_concept, insight)
+                }
+                for related_concept in relationships or []
+            ]
             
             # Auto-capture high-value insights
             importance = self._calculate_content_importance(insight, "insight")
-            if importance > 0.6:
-                self._auto_capture_memory(
-                    "insight",
-                    f"💡 {concept}: {insight}",
-                    {
-                        "concept": concept,
-                        "relationships": relationships,
-                        "session_goal": self.current_session.get("goal"),
-                        "confidence": insight_entry["confidence"],
-                        "timestamp": timestamp
-                    }
-                )
-                self.current_session.setdefault("intelligence", {}).setdefault("auto_captured_memories", 0)
-                self.current_session["intelligence"]["auto_captured_memories"] += 1
-            
-            self.current_session.setdefault("semantic", {}).setdefault("key_insights", []).append({
-                "timestamp": timestamp,
-                "insight": insight,
-                "concept": concept
-            })
+            payload = {"entry": insight_entry, "relationships": relationships_made}
+            captured = importance > 0.6 and self._auto_capture_memory(
+                "insight",
+                f"💡 {concept}: {insight}",
+                {
+                    "concept": concept,
+                    "relationships": relationships,
+                    "session_goal": self.current_session.get("goal"),
+                    "confidence": insight_entry["confidence"],
+                    "timestamp": timestamp
+                }
+            )
+            if captured:
+                payload["auto_captured"] = self.current_session.get("intelligence", {}).get("auto_captured_memories", 0)
             
-            self.current_session["last_updated"] = timestamp
-            self._save_current_session()
+            # Journal the semantic updates instead of rewriting the whole session
+            self._record("insight", payload)
             
             response = f"💡 Insight captured: {insight}"
-            if importance > 0.6:
+            if captured:
                 response += f"\n🧠 Auto-stored in memory (importance: {importance:.2f})"
             if relationships:
                 response += f"\n🔗 Connected to: {', '.join(relationships)}"
@@ -566,13 +1183,14 @@ class EnhancedSessionTool:
         confidence = 0.5
         
         # Length and detail factors
-        if len(insight) > 50:
+        length = len(insight)
+        if length > 50:
             confidence += 0.2
-        if len(insight) > 150:
+        if length > 150:
             confidence += 0.2
         
         # Specificity indicators
-        if any(tok in insight.lower() for tok in ["because", "therefore", "thus", "hence", "due to"]):
+        if _SPECIFICITY_RE.search(insight):
             confidence += 0.1
         
         return min(confidence, 1.0)
@@ -582,7 +1200,7 @@ class EnhancedSessionTool:
         base = 0.3
         if concept1 and concept2:
             base += 0.2
-        overlap = len(set(concept1.lower().split()) & set(concept2.lower().split()))
+        overlap = len(_concept_words(concept1) & _concept_words(concept2))
         base += min(0.1 * overlap, 0.2)
         if len(context) > 80:
             base += 0.1
@@ -595,68 +1213,71 @@ class EnhancedSessionTool:
         if not target_session_id:
             return "No session specified and no active session"
         
-        session_file = self.sessions_dir / f"{target_session_id}.json"
-        if not session_file.exists():
+        if self._find_session_file(target_session_id) is None:
             return f"Session {target_session_id} not found"
         
         try:
-            with open(session_file, 'r', encoding='utf-8') as f:
-                session = json.load(f)
+            session = self._load_session(target_session_id)
             
             insights = []
-            insights.append(f"🧠 Session Intelligence Report: {target_session_id[:8]}")
-            insights.append("=" * 60)
+            add = insights.append
             
             # Basic metrics
             goal = session.get("goal", "No goal specified")
-            created = datetime.fromtimestamp(session.get("created", 0))
-            duration = session.get("last_updated", session.get("created", 0)) - session.get("created", 0)
-            
-            insights.append(f"🎯 Goal: {goal}")
-            insights.append(f"📅 Started: {created.strftime('%Y-%m-%d %H:%M:%S')}")
-            insights.append(f"⏱️ Duration: {duration/60:.1f} minutes")
+            duration = to_seconds(session.get("last_updated", session.get("created", 0))) - to_seconds(session.get("created", 0))
+            duration_min = duration / 60
             
             # Intelligence metrics
             intelligence = session.get("intelligence", {})
             auto_memories = intelligence.get("auto_captured_memories", 0)
-            insights.append(f"🧠 Auto-captured memories: {auto_memories}")
+            
+            insights.extend((
+                f"🧠 Session Intelligence Report: {target_session_id[:8]}",
+                "=" * 60,
+                f"🎯 Goal: {goal}",
+                f"📅 Started: {_fmt_ts_seconds(session.get('created', 0))}",
+                "⏱️ Duration: %.1f minutes" % duration_min,
+                "🧠 Auto-captured memories: %d" % auto_memories,
+            ))
             
             # Event analysis
-            events = session.get("episodic", {}).get("events", [])
+            events = self._all_events(target_session_id, session)
             if events:
-                insights.append(f"\n📝 Events ({len(events)} total):\n")
-                types = Counter(e.get("type", "?") for e in events)
+                types = Counter(session["episodic"].get("type_counts") or (e.get("type", "?") for e in events))
                 top_types = ", ".join(f"{t}({c})" for t,c in types.most_common(5))
-                insights.append(f"  • Types: {top_types}")
+                add(f"\n📝 Events ({len(events)} total):\n")
+                add(f"  • Types: {top_types}")
                 
                 # Energy progression
                 energy_progression = self._extract_energy_progression(events)
                 if energy_progression:
-                    insights.append(f"  • Energy progression: {' -> '.join(energy_progression[:6])}{'...' if len(energy_progression)>6 else ''}")
+                    add(f"  • Energy progression: {' -> '.join(energy_progression[:6])}{'...' if len(energy_progression)>6 else ''}")
             
             # Concepts and insights
             semantic = session.get("semantic", {})
             key_insights = semantic.get("key_insights", [])
-            insights.append(f"\n💡 Key Insights: {len(key_insights)}")
+            add(f"\n💡 Key Insights: {len(key_insights)}")
             for ki in key_insights[:3]:
-                insights.append(f"  • {ki.get('concept', '')}: {ki.get('insight', '')}")
+                add(f"  • {ki.get('concept', '')}: {ki.get('insight', '')}")
             
             workflows = session.get("procedural", {}).get("workflows", [])
             if workflows:
-                insights.append(f"\n⚙️ Learned Workflows ({len(workflows)}):")
+                add(f"\n⚙️ Learned Workflows ({len(workflows)}):")
                 for workflow in workflows[:3]:
                     name = workflow.get("name", "Unnamed")
                     steps = len(workflow.get("steps", []))
                     frequency = workflow.get("frequency", 1)
-                    insights.append(f"  • {name}: {steps} steps (used {frequency}x)")
+                    add(f"  • {name}: {steps} steps (used {frequency}x)")
             
             # Success indicators
             if duration > 1800 and len(key_insights) > 2:  # 30 min with insights
-                insights.append(f"\n✨ Success Indicators:")
-                insights.append(f"  • Sustained focus ({duration/60:.1f} minutes)")
-                insights.append(f"  • High insight generation ({len(key_insights)} insights)")
+                insights.extend((
+                    "\n✨ Success Indicators:",
+                    "  • Sustained focus (%.1f minutes)" % duration_min,
+                    "  • High insight generation (%d insights)" % len(key_insights),
+                ))
                 if auto_memories > 3:
-                    insights.append(f"  • Rich auto-memory formation ({auto_memories} entries)")
+                    add(f"  • Rich auto-memory formation ({auto_memories} entries)")
             
             return "\n".join(insights)
             
@@ -669,26 +1290,55 @@ class EnhancedSessionTool:
         cutoff = time.time() - days_back*24*60*60
         try:
             index = self._load_index()
+            session_files, journaled = self._scan_session_files()
             recent_sessions = []
+            # (slot in recent_sessions, snapshot path) of summaries still to parse
+            pending = []
             for sid, meta in index.items():
-                f = self.sessions_dir / f"{sid}.json"
-                if f.exists() and meta.get('created', 0) >= cutoff:
-                    with open(f, 'r', encoding='utf-8') as fh:
-                        recent_sessions.append(json.load(fh))
+                # Window on last activity; rows written before last_updated was indexed fall back to created
+                if to_seconds(meta.get('last_updated', meta.get('created', 0))) < cutoff:
+                    continue
+                if sid == self.current_session_id and self.current_session:
+                    recent_sessions.append(self.current_session)
+                    continue
+                entry = session_files.get(sid)
+                if entry is None:
+                    continue
+                if sid in journaled:
+                    # Snapshot is behind its journal (e.g. after a crash); replay it
+                    recent_sessions.append(self._load_session(sid))
+                else:
+                    pending.append((len(recent_sessions), entry.path))
+                    recent_sessions.append(None)
+            if _SUMMARY_WORKERS > 1 and len(pending) >= _PARALLEL_SUMMARY_MIN:
+                # File reads and zstd decompression release the GIL, so a few threads overlap them
+                with ThreadPoolExecutor(max_workers=min(_SUMMARY_WORKERS, len(pending))) as pool:
+                    summaries = list(pool.map(self._load_session_summary, [path for _, path in pending]))
+            else:
+                summaries = [self._load_session_summary(path) for _, path in pending]
+            for (slot, _), summary in zip(pending, summaries):
+                recent_sessions[slot] = summary
             if not recent_sessions:
                 return "No sessions found in the specified time window"
             
-            analysis = []
-            analysis.append("📈 Cross-Session Analysis")
-            analysis.append("="*40)
-            analysis.append(f"Analyzed sessions: {len(recent_sessions)} (last {days_back} days)")
+            analysis = [
+                "📈 Cross-Session Analysis",
+                "="*40,
+                f"Analyzed sessions: {len(recent_sessions)} (last {days_back} days)",
+            ]
             
-            # Success metric
-            successful_sessions = []
+            # Success metric, aggregated in one pass
+            successes = 0
+            total_duration = 0.0
+            total_insights = 0
+            success_factors = Counter()
             for session in recent_sessions:
-                duration = session.get("last_updated", session.get("created", 0)) - session.get("created", 0)
-                insights = len(session.get("semantic", {}).get("key_insights", []))
-                auto_memories = session.get("intelligence", {}).get("auto_captured_memories", 0)
+                created = session.get("created", 0)
+                duration = to_seconds(session.get("last_updated", created)) - to_seconds(created)
+                semantic = session.get("semantic")
+                insights = len(semantic.get("key_insights", ())) if semantic else 0
+                intelligence = session.get("intelligence")
+                auto_memories = intelligence.get("auto_captured_memories", 0) if intelligence else 0
                 success_score = 0
                 if duration > 1800:
                     success_score += 1
@@ -697,62 +1347,139 @@ class EnhancedSessionTool:
                 if auto_memories > 3:
                     success_score += 1
                 if success_score >= 3:
-                    successful_sessions.append({
-                        "session": session,
-                        "score": success_score,
-                        "duration": duration,
-                        "insights": insights
-                    })
-            analysis.append(f"\n✨ Success Analysis:")
-            analysis.append(f"  • Successful sessions: {len(successful_sessions)}/{len(recent_sessions)}")
-            if successful_sessions:
-                avg_duration = sum(s["duration"] for s in successful_sessions) / len(successful_sessions)
-                avg_insights = sum(s["insights"] for s in successful_sessions) / len(successful_sessions)
-                analysis.append(f"  • Average successful duration: {avg_duration/60:.1f} minutes")
-                analysis.append(f"  • Average insights per success: {avg_insights:.1f}")
-                success_factors = []
-                for s in successful_sessions:
-                    focus_areas = s["session"].get("metadata", {}).get("attention_focus", [])
-                    success_factors.extend(focus_areas)
+                    successes += 1
+                    total_duration += duration
+                    total_insights += insights
+                    metadata = session.get("metadata")
+                    if metadata:
+                        success_factors.update(metadata.get("attention_focus", ()))
+            analysis.extend((
+                "\n✨ Success Analysis:",
+                f"  • Successful sessions: {successes}/{len(recent_sessions)}",
+            ))
+            if successes:
+                analysis.extend((
+                    "  • Average successful duration: %.1f minutes" % (total_duration / successes / 60),
+                    "  • Average insights per success: %.1f" % (total_insights / successes),
+                ))
                 if success_factors:
-                    top = Counter(success_factors).most_common(5)
+                    top = success_factors.most_common(5)
                     analysis.append("  • Frequent success focus areas: " + ", ".join(f"{k}({v})" for k,v in top))
             return "\n".join(analysis)
         except Exception as e:
             self.logger.error(f"Cross-session analysis failed: {e}")
             return f"Cross-session analysis failed: {e}"
     
+    def _scan_session_files(self) -> Tuple[Dict[str, os.DirEntry], set]:
+        """Map session ids to their files, and find sessions with a pending journal, in one directory read"""
+        files = {}
+        journaled = set()
+        with os.scandir(self.sessions_dir) as it:
+            for e in it:
+                if e.name.endswith('.journal.jsonl'):
+                    journaled.add(e.name[:-14])
+                elif e.name.endswith('.json.zst') and e.is_file():
+                    files[e.name[:-9]] = e
+                elif e.name.endswith('.json') and e.is_file():
+                    files.setdefault(e.name[:-5], e)
+        return files, journaled
+    
+    def _session_entries(self) -> Dict[str, os.DirEntry]:
+        """Session id -> snapshot entry, from a directory listing cached by the directory's mtime"""
+        try:
+            mtime_ns = os.stat(self.sessions_dir).st_mtime_ns
+        except OSError:
+            return {}
+        listing = self._session_listing
+        if listing is None or listing[0] != mtime_ns:
+            listing = (mtime_ns, self._scan_session_files()[0])
+            self._session_listing = listing
+        return listing[1]
+
+    def _session_exists(self, session_id: str) -> bool:
+        """Whether a session has a snapshot, answered from the cached listing alone"""
+        return session_id in self._session_entries()
+
+    def _find_session_file(self, session_id: str) -> Optional[Path]:
+        """Snapshot file of a session, or None; confirms listing misses on disk"""
+        entry = self._session_entries().get(session_id)
+        if entry is not None:
+            return Path(entry.path)
+        # The listing can lag a write made within the directory's mtime granularity
+        for path in (self.sessions_dir / f"{session_id}.json.zst", self.sessions_dir / f"{session_id}.json"):
+            if path.exists():
+                return path
+        return None
+
+    def _load_session_summary(self, path: str) -> Dict[str, Any]:
+        """Load only the top-level session fields used for cross-session analysis"""
+        summary = {}
+        if path.endswith('.zst'):
+            data = _read_compressed(path)
+            if not MSGSPEC_AVAILABLE:
+                session = _decode_json(data)
+                return {k: v for k, v in session.items() if k in _SUMMARY_FIELDS}
+        elif MSGSPEC_AVAILABLE:
+            with open(path, 'rb') as fh:
+                if os.fstat(fh.fileno()).st_size >= _MMAP_MIN_BYTES:
+                    # Decode straight from the page cache instead of copying the file first
+                    with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                        return _summary_fields(_SESSION_SUMMARY_DECODER.decode(view))
+                data = fh.read()
+        if MSGSPEC_AVAILABLE:
+            return _summary_fields(_SESSION_SUMMARY_DECODER.decode(data))
+        if not IJSON_AVAILABLE:
+            session = _read_json(path)
+            return {k: v for k, v in session.items() if k in _SUMMARY_FIELDS}
+        with open(path, 'rb') as fh:
+            for key, value in ijson.kvitems(fh, '', use_float=True):
+                if key in _SUMMARY_FIELDS:
+                    summary[key] = value
+                    if len(summary) == len(_SUMMARY_FIELDS):
+                        break
+        return summary
+    
     def bb7_pause_session(self, reason: Optional[str] = None) -> str:
         """Pause the current session"""
         if not self.current_session_id or not self.current_session:
             return "No active session to pause."
         with self._lock:
             self.current_session["status"] = "paused"
-            self.current_session["last_updated"] = time.time()
+            self.current_session["last_updated"] = _now()
             self.current_session.setdefault("metadata", {})["pause_reason"] = reason or "unspecified"
-            self._save_current_session()
             index = self._load_index()
             if self.current_session_id in index:
-                index[self.current_session_id]["status"] = "paused"
+                self._set_index_status(index, self.current_session_id, "paused")
                 self._save_index(index)
-            return f"⏸️ Session {self.current_session_id[:8]} paused."
+            session_id = self.current_session_id
+            self._dirty.add("session")
+            writes = self._collect_writes()
+        # Pausing is a checkpoint, so write through instead of waiting for the timer
+        self._commit_writes(writes)
+        return f"⏸️ Session {session_id[:8]} paused."
 
     def bb7_resume_session(self, session_id: str) -> str:
         """Resume a paused session"""
-        f = self.sessions_dir / f"{session_id}.json"
-        if not f.exists():
+        if self._find_session_file(session_id) is None:
             return f"Session {session_id} not found"
         try:
-            with open(f, 'r', encoding='utf-8') as fh:
-                self.current_session = json.load(fh)
-            self.current_session_id = session_id
-            self.current_session["status"] = "active"
-            self.current_session["last_updated"] = time.time()
-            self._save_current_session()
-            index = self._load_index()
-            if session_id in index:
-                index[session_id]["status"] = "active"
-                self._save_index(index)
+            with self._lock:
+                # Flush the outgoing session first; it may be the one being resumed
+                self._compact_journal()
+                session = self._load_session(session_id)
+                # The session becomes mutable live state, so it must not stay shared with the cache
+                with self._session_cache_lock:
+                    self._session_cache.pop(session_id, None)
+                self._activate_session(session_id, session)
+                self.current_session["status"] = "active"
+                self.current_session["last_updated"] = _now()
+                index = self._load_index()
+                if session_id in index:
+                    self._set_index_status(index, session_id, "active")
+                    self._save_index(index)
+                self._dirty.add("session")
+                writes = self._collect_writes()
+            self._commit_writes(writes)
             return f"▶️ Resumed session {session_id[:8]}"
         except Exception as e:
             self.logger.error(f"Failed to resume session {session_id}: {e}")
@@ -761,15 +1488,13 @@ class EnhancedSessionTool:
     def bb7_list_sessions(self, status: Optional[str] = None, limit: int = 20) -> str:
         """List all sessions with optional status filter"""
         try:
-            index = self._load_index()
-            items = list(index.items())
-            if status:
-                items = [(k,v) for k,v in items if v.get('status') == status]
-            items.sort(key=lambda kv: kv[1].get('created', 0), reverse=True)
-            items = items[:max(1, limit)]
+            with self._lock:
+                index, (by_created, by_status) = self._load_index_views()
+                newest = by_status.get(status, []) if status else by_created
+                items = [(sid, index[sid]) for _, sid in newest[:max(1, limit)]]
             lines = ["📋 Sessions:"]
             for sid, meta in items:
-                created = datetime.fromtimestamp(meta.get('created', 0)).strftime('%Y-%m-%d %H:%M')
+                created = _fmt_ts(meta.get('created', 0))
                 lines.append(f"  • {sid[:8]} [{meta.get('status','?')}] {created} - {meta.get('goal','')}")
             return "\n".join(lines)
         except Exception as e:
@@ -778,54 +1503,97 @@ class EnhancedSessionTool:
 
     def bb7_get_session_summary(self, session_id: str) -> str:
         """Get a detailed summary of a specific session"""
-        f = self.sessions_dir / f"{session_id}.json"
-        if not f.exists():
+        f = self._find_session_file(session_id)
+        if f is None:
             return f"Session {session_id} not found"
         try:
-            with open(f, 'r', encoding='utf-8') as fh:
-                session = json.load(fh)
-            summary = []
-            summary.append(f"📄 Session Summary: {session_id[:8]}")
-            created = datetime.fromtimestamp(session.get('created', 0))
-            updated = datetime.fromtimestamp(session.get('last_updated', session.get('created', 0)))
-            summary.append(f"🎯 Goal: {session.get('goal','')}")
-            summary.append(f"📅 Created: {created.strftime('%Y-%m-%d %H:%M:%S')}")
-            summary.append(f"🔄 Last Updated: {updated.strftime('%Y-%m-%d %H:%M:%S')}")
-            summary.append(f"📊 Status: {session.get('status', 'Unknown')}")
-            tags = session.get("tags", [])
+            view = self._load_summary_view(session_id, f)
+            buf = io.StringIO()
+            w = buf.write
+            w(f"📄 Session Summary: {session_id[:8]}\n")
+            w(f"🎯 Goal: {view.get('goal','')}\n")
+            w(f"📅 Created: {_fmt_ts_seconds(view.get('created', 0))}\n")
+            w(f"🔄 Last Updated: {_fmt_ts_seconds(view.get('last_updated', view.get('created', 0)))}\n")
+            w(f"📊 Status: {view.get('status', 'Unknown')}\n")
+            tags = view.get("tags", [])
             if tags:
-                summary.append(f"🏷️ Tags: {', '.join(tags)}")
+                w(f"🏷️ Tags: {', '.join(tags)}\n")
             # Episodic
-            episodic = session.get("episodic", {})
-            events = episodic.get("events", [])
-            if events:
-                summary.append(f"\n📝 Events ({len(events)} total):\n")
-                for event in events[-10:]:
-                    event_time = datetime.fromtimestamp(event["timestamp"]).strftime("%H:%M")
-                    summary.append(f"  • {event_time}: {event['description']}")
+            if view["event_count"]:
+                w(f"\n📝 Events ({view['event_count']} total):\n\n")
+                for event in view["recent_events"]:
+                    w(f"  • {_fmt_ts(event['timestamp'], '%H:%M')}: {event['description']}\n")
             # Semantic
-            semantic = session.get("semantic", {})
-            concepts = semantic.get("concepts", {})
-            insights = semantic.get("key_insights", [])
-            if concepts:
-                summary.append(f"\n🧠 Concepts ({len(concepts)}):\n")
-                for concept, data in list(concepts.items())[:5]:
-                    summary.append(f"  • {concept}: {len(data.get('insights', []))} insights")
-            if insights:
-                summary.append(f"\n💡 Key Insights ({len(insights)}):\n")
-                for ins in insights[-5:]:
-                    summary.append(f"  • {ins['insight']}")
+            if view["concept_count"]:
+                w(f"\n🧠 Concepts ({view['concept_count']}):\n\n")
+                for concept, insight_count in view["top_concepts"]:
+                    w(f"  • {concept}: {insight_count} insights\n")
+            if view["insight_count"]:
+                w(f"\n💡 Key Insights ({view['insight_count']}):\n\n")
+                for ins in view["recent_insights"]:
+                    w(f"  • {ins}\n")
             # Focus
-            meta = session.get("metadata", {})
+            meta = view["focus"]
             energy = meta.get("energy_level", "medium")
             momentum = meta.get("momentum", "starting")
-            summary.append(f"\n🎯 Focus: {', '.join(meta.get('attention_focus', [])) if meta.get('attention_focus') else 'n/a'}")
-            summary.append(f"⚡ Energy: {energy}, Momentum: {momentum}")
-            return "\n".join(summary)
+            w(f"\n🎯 Focus: {', '.join(meta.get('attention_focus', [])) if meta.get('attention_focus') else 'n/a'}\n")
+            w(f"⚡ Energy: {energy}, Momentum: {momentum}")
+            return buf.getvalue()
         except Exception as e:
             self.logger.error(f"Failed to summarize session {session_id}: {e}")
             return f"Failed to summarize session: {e}"
 
+    def bb7_export_session_json(self, session_id: str) -> str:
+        """Export a complete session, spilled events included, as indented JSON"""
+        if self._find_session_file(session_id) is None:
+            return f"Session {session_id} not found"
+        try:
+            session = self._load_session(session_id)
+            episodic = session.get("episodic", {})
+            if episodic.get("spilled_events"):
+                session = {**session, "episodic": {**episodic, "events": self._all_events(session_id, session)}}
+            return _encode_json(session, pretty=True).decode('utf-8')
+        except Exception as e:
+            self.logger.error(f"Failed to export session {session_id}: {e}")
+            return f"Failed to export session: {e}"
+
+    def _summary_view(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the small slice of a session that bb7_get_session_summary renders"""
+        episodic = session.get("episodic", {})
+        events = episodic.get("events", [])
+        semantic = session.get("semantic", {})
+        concepts = semantic.get("concepts", {})
+        insights = semantic.get("key_insights", [])
+        meta = session.get("metadata", {})
+        return {
+            "goal": session.get("goal", ""),
+            "status": session.get("status", "Unknown"),
+            "created": session.get("created", 0),
+            "last_updated": session.get("last_updated", session.get("created", 0)),
+            "tags": session.get("tags", []),
+            "event_count": episodic.get("spilled_events", 0) + len(events),
+            "recent_events": [{"timestamp": e["timestamp"], "description": e["description"]} for e in events[-10:]],
+            "concept_count": len(concepts),
+            "top_concepts": [[c, len(d.get("insights", []))] for c, d in list(concepts.items())[:5]],
+            "insight_count": len(insights),
+            "recent_insights": [i["insight"] for i in insights[-5:]],
+            "focus": {k: meta[k] for k in ("attention_focus", "energy_level", "momentum") if k in meta}
+        }
+
+    def _summary_path(self, session_id: str) -> Path:
+        # Kept in a subdirectory so "*.json" globs over sessions_dir only see snapshots
+        return self.summaries_dir / f"{session_id}.json"
+
+    def _load_summary_view(self, session_id: str, session_file: Path) -> Dict[str, Any]:
+        """Read the summary sidecar if it is current, otherwise parse the full session"""
+        if session_id != self.current_session_id and not self._journal_path(session_id).exists():
+            try:
+                if os.stat(self._summary_path(session_id)).st_mtime_ns >= os.stat(session_file).st_mtime_ns:
+                    return _read_json(self._summary_path(session_id))
+            except (OSError, ValueError):
+                pass
+        return self._summary_view(self._load_session(session_id))
+
     def bb7_link_memory_to_session(self, memory_key: str) -> str:
         """Link a memory key to the current session"""
         if not self.current_session_id or not self.current_session:
@@ -836,14 +1604,10 @@ class EnhancedSessionTool:
             session_id = self.current_session_id
 
             # Add memory to session's linked memories
-            session_memories = memory_index.setdefault("session_memories", {}).setdefault(session_id, [])
-            if memory_key not in session_memories:
-                session_memories.append(memory_key)
+            memory_index["session_memories"].setdefault(session_id, set()).add(memory_key)
 
             # Link memory to session
-            memory_to_sessions = memory_index.setdefault("memory_to_sessions", {}).setdefault(memory_key, [])
-            if session_id not in memory_to_sessions:
-                memory_to_sessions.append(session_id)
+            memory_index["memory_to_sessions"].setdefault(memory_key, set()).add(session_id)
 
             self._save_memory_index(memory_index)
 
@@ -870,349 +1634,436 @@ class EnhancedSessionTool:
         
         return response
 
-    def _load_index(self) -> Dict[str, Any]:
-        """Load the session index"""
-        if self.index_file.exists():
-            try:
-                with open(self.index_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                self.logger.error(f"Failed to load session index: {e}")
-        return {}
+    def bb7_learned_patterns(self) -> str:
+        """Summarize recurring patterns learned from past sessions"""
+        return self._render_json("patterns", self.learned_patterns)
 
-    def _save_index(self, index: Dict[str, Any]) -> None:
-        """Save the session index"""
+    def bb7_session_intelligence(self) -> str:
+        """Show raw intelligence metrics learned across sessions"""
+        return self._render_json("intelligence", self.session_intelligence)
+
+    def _render_json(self, key: str, data: Dict[str, Any]) -> str:
+        """Pretty-printed JSON for a tool response, reused until the data is next saved"""
+        rendered = self._rendered_json.get(key)
+        if rendered is None:
+            rendered = self._rendered_json[key] = json.dumps(data, indent=2)
+        return rendered
+
+    def _load_index(self) -> Dict[str, Any]:
+        """Load the session index, reusing the cached copy while the file is unchanged"""
+        if "index" in self._dirty:
+            return self._index_cache
+        try:
+            mtime_ns = os.stat(self.index_file).st_mtime_ns
+        except OSError:
+            self._index_cache, self._index_mtime_ns = None, None
+            return {}
+        if self._index_cache is not None and mtime_ns == self._index_mtime_ns:
+            return self._index_cache
         try:
-            with open(self.index_file, 'w', encoding='utf-8') as f:
-                json.dump(index, f, indent=2, ensure_ascii=False)
+            index = _read_json(self.index_file)
         except Exception as e:
-            self.logger.error(f"Failed to save session index: {e}")
+            self.logger.error(f"Failed to load session index: {e}")
+            return {}
+        if self._index_cache is not None:
+            # Index was rewritten behind our back
+            self._recommendations_cache.cache_clear()
+        self._index_cache, self._index_mtime_ns = index, mtime_ns
+        return index
+
+    def _load_index_views(self) -> Tuple[Dict[str, Any], Tuple[List[Tuple[float, str]], Dict[str, List[Tuple[float, str]]]]]:
+        """Return the index with its sorted/status views, rebuilding them after a reload"""
+        index = self._load_index()
+        if self._index_views_for is not index:
+            by_created = sorted((-to_seconds(info.get("created", 0)), sid) for sid, info in index.items())
+            by_status = defaultdict(list)
+            for key in by_created:
+                by_status[index[key[1]].get("status")].append(key)
+            self._index_views, self._index_views_for = (by_created, by_status), index
+        return index, self._index_views
+
+    def _add_index_entry(self, index: Dict[str, Any], session_id: str, info: Dict[str, Any]) -> None:
+        index[session_id] = info
+        if self._index_views_for is index:
+            by_created, by_status = self._index_views
+            key = (-to_seconds(info.get("created", 0)), session_id)
+            bisect.insort(by_created, key)
+            bisect.insort(by_status[info.get("status")], key)
+
+    def _set_index_status(self, index: Dict[str, Any], session_id: str, status: str) -> None:
+        old = index[session_id].get("status")
+        index[session_id]["status"] = status
+        if self._index_views_for is index and old != status:
+            by_status = self._index_views[1]
+            key = (-to_seconds(index[session_id].get("created", 0)), session_id)
+            old_keys = by_status[old]
+            pos = bisect.bisect_left(old_keys, key)
+            if pos < len(old_keys) and old_keys[pos] == key:
+                del old_keys[pos]
+            bisect.insort(by_status[status], key)
+
+    def _save_index(self, index: Dict[str, Any]) -> None:
+        """Stage the session index for the next flush"""
+        # Session history changed, so memoized recommendations are stale
+        self._recommendations_cache.cache_clear()
+        self._index_cache = index
+        self._mark_dirty("index")
+
+    def _sync_index_row(self) -> None:
+        """Copy the current session's last_updated into its index row so durations need no session reads"""
+        index = self._load_index()
+        row = index.get(self.current_session_id)
+        last_updated = self.current_session.get("last_updated")
+        if row is not None and row.get("last_updated") != last_updated:
+            row["last_updated"] = last_updated
+            # Session durations changed, so memoized recommendations are stale
+            self._recommendations_cache.cache_clear()
+            self._index_cache = index
+            self._dirty.add("index")
+
+    def _mark_dirty(self, target: str) -> None:
+        """Schedule a debounced flush of one of the targets in self._dirty"""
+        self._dirty.add(target)
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(_FLUSH_DELAY, self._on_flush_timer)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _on_flush_timer(self) -> None:
+        with self._lock:
+            writes = self._collect_writes()
+        self._commit_writes(writes)
+
+    def _flush_dirty(self) -> None:
+        """Write every dirty target now"""
+        with self._lock:
+            writes = self._collect_writes()
+        self._commit_writes(writes)
+
+    def _collect_writes(self) -> List[Tuple[str, ...]]:
+        """Serialize every dirty target and clear it; caller holds self._lock"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        writes = []
+        if "session" in self._dirty and self.current_session_id and self.current_session:
+            self._sync_index_row()
+            self._write_gen += 1
+            writes.append(("session", self._write_gen, self.current_session_id, self._journal_seq,
+                           _encode_json(self.current_session, self._pretty_print),
+                           _encode_json(self._summary_view(self.current_session))))
+        if "index" in self._dirty and self._index_cache is not None:
+            self._write_gen += 1
+            writes.append(("index", self._write_gen, self.index_file, _encode_json(self._index_cache, self._pretty_print)))
+        if "memory_index" in self._dirty and self._memory_index_cache is not None:
+            self._write_gen += 1
+            stored = {side: {k: sorted(v) for k, v in links.items()}
+                      for side, links in self._memory_index_cache.items()}
+            writes.append(("memory_index", self._write_gen, self.memory_index_file, _encode_json(stored, self._pretty_print)))
+        if "patterns" in self._dirty:
+            self._write_gen += 1
+            writes.append(("patterns", self._write_gen, self.patterns_file, _encode_json(self.learned_patterns, self._pretty_print)))
+        if "intelligence" in self._dirty:
+            self._write_gen += 1
+            writes.append(("intelligence", self._write_gen, self.intelligence_file,
+                           _encode_json(self.session_intelligence, self._pretty_print)))
+        self._dirty.clear()
+        return writes
+
+    def _commit_writes(self, writes: List[Tuple[str, ...]]) -> None:
+        """Write snapshots from _collect_writes without holding self._lock"""
+        done = []
+        with self._write_lock:
+            for kind, gen, *rest in writes:
+                key = rest[0] if kind == "session" else kind
+                # A newer snapshot of the same file already landed
+                if gen < self._written_gen.get(key, 0):
+                    continue
+                try:
+                    if kind == "session":
+                        session_id, _, data, summary = rest
+                        path = self.sessions_dir / f"{session_id}.json"
+                        compressed = self.sessions_dir / f"{session_id}.json.zst"
+                        # Once a session is compressed it stays compressed
+                        if self._compress and ZSTD_AVAILABLE and (len(data) > _COMPRESS_MIN_BYTES or compressed.exists()):
+                            data = zstandard.ZstdCompressor(level=1).compress(data)
+                            path, stale = compressed, path
+                        else:
+                            stale = compressed
+                        _write_bytes(path, data)
+                        _write_bytes(self._summary_path(session_id), summary)
+                        try:
+                            stale.unlink()
+                        except FileNotFoundError:
+                            pass
+                    else:
+                        path, data = rest
+                        _write_bytes(path, data)
+                    self._written_gen[key] = gen
+                    done.append((kind, rest, os.stat(path).st_mtime_ns))
+                except Exception as e:
+                    self.logger.error(f"Failed to write {kind} snapshot for {key}: {e}")
+        if not done:
+            return
+        with self._lock:
+            for kind, rest, mtime_ns in done:
+                if kind == "index":
+                    self._index_mtime_ns = mtime_ns
+                elif kind == "memory_index":
+                    self._memory_index_mtime_ns = mtime_ns
+                elif kind == "session":
+                    # Directory mtimes can be coarser than our writes; don't trust the cached listing
+                    self._session_listing = None
+                    if rest[0] == self.current_session_id:
+                        self._session_mtime_ns = mtime_ns
+                        # Only drop the journal if nothing was appended after the snapshot
+                        if self._journal_pending and self._journal_seq == rest[1]:
+                            self._truncate_journal()
 
     def _capture_environment_state(self) -> Dict[str, Any]:
         """Capture current development environment state"""
         env = {
             "cwd": os.getcwd(),
-            "timestamp": time.time(),
+            "timestamp": _now(),
         }
         return env
 
     def _load_current_session(self) -> None:
         """Load the current session from disk"""
-        if not self.current_session_id:
+        if not self.current_session_id or "session" in self._dirty:
             return
-        f = self.sessions_dir / f"{self.current_session_id}.json"
-        if f.exists():
-            try:
-                with open(f, 'r', encoding='utf-8') as fh:
-                    self.current_session = json.load(fh)
-            except Exception as e:
-                self.logger.error(f"Failed to load session {self.current_session_id}: {e}")
+        f = self._session_path(self.current_session_id)
+        try:
+            mtime_ns = f.stat().st_mtime_ns
+        except OSError:
+            return
+        # In-memory copy is authoritative unless the file changed behind our back
+        if self.current_session is not None and mtime_ns == self._session_mtime_ns:
+            return
+        try:
+            session, self._journal_pending = self._read_session_file(self.current_session_id)
+            self._activate_session(self.current_session_id, session)
+            self._session_mtime_ns = mtime_ns
+        except Exception as e:
+            self.logger.error(f"Failed to load session {self.current_session_id}: {e}")
+
+    def _activate_session(self, session_id: str, session: Dict[str, Any]) -> None:
+        """Make a session current and rebuild its in-memory lookup tables"""
+        self.current_session_id = session_id
+        self.current_session = session
+        self._journal_seq = session.get("journal_seq", 0)
+        workflows = session.get("procedural", {}).get("workflows", [])
+        self._workflow_index = {w.get("name"): i for i, w in enumerate(workflows)}
 
     def _save_current_session(self) -> None:
-        """Save the current session to disk"""
-        if not self.current_session_id or not self.current_session:
+        """Save the current session (and any other dirty state) to disk now"""
+        self._dirty.add("session")
+        self._flush_dirty()
+
+    def _session_path(self, session_id: str) -> Path:
+        """Snapshot file of a session, preferring the compressed variant when one exists"""
+        return self._find_session_file(session_id) or self.sessions_dir / f"{session_id}.json"
+
+    def _read_session_file(self, session_id: str) -> Tuple[Dict[str, Any], int]:
+        """Load a session snapshot and replay its journal; returns (session, replayed ops)"""
+        session = _read_json(self._session_path(session_id))
+        return session, self._replay_journal(session_id, session)
+
+    def _load_session(self, session_id: str) -> Dict[str, Any]:
+        """Return the live current session, or another session via the parsed-session LRU"""
+        if session_id == self.current_session_id and self.current_session:
+            return self.current_session
+        stamp = self._session_stamp(session_id)
+        with self._session_cache_lock:
+            cached = self._session_cache.get(session_id)
+            if cached is not None and cached[0] == stamp:
+                self._session_cache.move_to_end(session_id)
+                return cached[1]
+        session = self._read_session_file(session_id)[0]
+        with self._session_cache_lock:
+            self._session_cache[session_id] = (stamp, session)
+            self._session_cache.move_to_end(session_id)
+            while len(self._session_cache) > _SESSION_CACHE_SIZE:
+                self._session_cache.popitem(last=False)
+        return session
+
+    def _session_stamp(self, session_id: str) -> Tuple[Any, ...]:
+        """Identify the on-disk state of a session: snapshot and journal (mtime, size)"""
+        st = os.stat(self._session_path(session_id))
+        try:
+            js = os.stat(self._journal_path(session_id))
+            journal = (js.st_mtime_ns, js.st_size)
+        except FileNotFoundError:
+            journal = None
+        return (st.st_mtime_ns, st.st_size, journal)
+
+    def _events_path(self, session_id: str) -> Path:
+        return self.sessions_dir / f"{session_id}.events.jsonl"
+
+    def _spill_events(self) -> None:
+        """Move the oldest events of the current session to its shard once the log outgrows the window"""
+        episodic = self.current_session["episodic"]
+        events = episodic["events"]
+        if len(events) <= _EVENT_WINDOW:
             return
-        f = self.sessions_dir / f"{self.current_session_id}.json"
+        spilled = episodic.get("spilled_events", 0)
+        data = b"".join(_encode_json(e) + b"\n" for e in events[:_EVENT_SPILL])
+        try:
+            with open(self._events_path(self.current_session_id), 'ab') as fh:
+                # Only the shard's first spilled_bytes are committed; drop a tail from a spill whose
+                # journal op never landed. Shards from before spilled_bytes are kept whole
+                committed = episodic.get("spilled_bytes", 0 if not spilled else None)
+                if committed is None:
+                    committed = fh.seek(0, os.SEEK_END)
+                else:
+                    fh.truncate(committed)
+                fh.write(data)
+        except Exception as e:
+            self.logger.error(f"Failed to spill events for session {self.current_session_id}: {e}")
+            return
+        # The shard write is committed by this op; replay drops the same events from the snapshot
+        self._record("spill", {"count": _EVENT_SPILL, "spilled": spilled + _EVENT_SPILL,
+                               "bytes": committed + len(data)})
+
+    def _all_events(self, session_id: str, session: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Return every event of a session, oldest first, including spilled ones"""
+        episodic = session.get("episodic", {})
+        events = episodic.get("events", [])
+        if not episodic.get("spilled_events"):
+            return events
+        spilled = []
+        try:
+            with open(self._events_path(session_id), 'rb') as fh:
+                # Bytes past spilled_bytes belong to a spill that was never committed
+                data = fh.read(episodic.get("spilled_bytes", -1))
+            spilled = [_decode_json(line) for line in data.splitlines() if line.strip()]
+        except Exception as e:
+            self.logger.error(f"Failed to read spilled events for session {session_id}: {e}")
+        return spilled + events
+
+    def _journal_path(self, session_id: str) -> Path:
+        return self.sessions_dir / f"{session_id}.journal.jsonl"
+
+    def _record(self, op: str, payload: Dict[str, Any]) -> None:
+        """Apply a mutation to the current session and append it to the journal"""
+        now = _now()
+        self._journal_seq += 1
+        _SESSION_OPS[op](self.current_session, payload)
+        self.current_session["last_updated"] = now
+        self.current_session["journal_seq"] = self._journal_seq
         try:
-            with open(f, 'w', encoding='utf-8') as fh:
-                json.dump(self.current_session, fh, indent=2, ensure_ascii=False)
+            if self._journal_fp is None:
+                self._journal_fp = open(self._journal_path(self.current_session_id), 'ab')
+            self._journal_fp.write(_encode_json({"seq": self._journal_seq, "t": now, "op": op, "p": payload}) + b"\n")
+            self._journal_fp.flush()
+            self._journal_pending += 1
         except Exception as e:
-            self.logger.error(f"Failed to save session {self.current_session_id}: {e}")
+            self.logger.error(f"Failed to journal '{op}' for session {self.current_session_id}: {e}")
+            self._save_current_session()
+            return
+        if self._journal_pending >= _SNAPSHOT_EVERY:
+            self._mark_dirty("session")
+
+    def _replay_journal(self, session_id: str, session: Dict[str, Any]) -> int:
+        """Apply journaled ops newer than the snapshot; returns the number applied"""
+        return _apply_journal(self._journal_path(session_id), session)
+
+    def _truncate_journal(self) -> None:
+        if self._journal_fp is not None:
+            self._journal_fp.close()
+            self._journal_fp = None
+        try:
+            self._journal_path(self.current_session_id).unlink()
+        except FileNotFoundError:
+            pass
+        self._journal_pending = 0
+
+    def _compact_journal(self) -> None:
+        """Fold pending journal entries and unflushed changes into a full snapshot of the current session"""
+        if self._journal_pending or "session" in self._dirty:
+            self._save_current_session()
+        if self._journal_fp is not None:
+            self._journal_fp.close()
+            self._journal_fp = None
+
+    def shutdown(self) -> None:
+        """Persist any journaled or unflushed session state before the server exits"""
+        with self._lock:
+            self._compact_journal()
+            self._flush_dirty()
+            self._drain_memory_queue()
 
     def _load_memory_index(self) -> Dict[str, Any]:
-        """Load the memory-session mapping"""
-        memory_index_file = self.sessions_dir / "memory_index.json"
-        if memory_index_file.exists():
+        """Load the memory-session mapping, reusing the cached copy while the file is unchanged"""
+        if "memory_index" in self._dirty:
+            return self._memory_index_cache
+        try:
+            mtime_ns = os.stat(self.memory_index_file).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if self._memory_index_cache is not None and mtime_ns == self._memory_index_mtime_ns:
+            return self._memory_index_cache
+        memory_index = {"memory_to_sessions": {}, "session_memories": {}}
+        if mtime_ns is not None:
             try:
-                with open(memory_index_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                stored = _read_json(self.memory_index_file)
+                # Lists on disk, sets in memory for O(1) link checks
+                for side in memory_index:
+                    memory_index[side] = {k: set(v) for k, v in stored.get(side, {}).items()}
             except Exception as e:
                 self.logger.error(f"Failed to load memory index: {e}")
-        return {"memory_to_sessions": {}, "session_memories": {}}
+        self._memory_index_cache, self._memory_index_mtime_ns = memory_index, mtime_ns
+        return memory_index
 
     def _save_memory_index(self, memory_index: Dict[str, Any]) -> None:
-        """Save the memory-session mapping"""
-        memory_index_file = self.sessions_dir / "memory_index.json"
-        try:
-            with open(memory_index_file, 'w', encoding='utf-8') as f:
-                json.dump(memory_index, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            self.logger.error(f"Failed to save memory index: {e}")
+        """Stage the memory-session mapping for the next flush"""
+        self._memory_index_cache = memory_index
+        self._mark_dirty("memory_index")
 
+    @_require_session
     def bb7_record_workflow(self, workflow_name: str, steps: List[str], 
                            context: Optional[str] = None) -> str:
         """Record a procedural workflow or pattern"""
-        if not self.current_session_id:
-            return "No active session. Start a session first with bb7_start_session."
-        if not self.current_session:
-            self._load_current_session()
-            if not self.current_session:
-                return "Failed to load current session. Please start a new session."
         with self._lock:
-            wf = {
-                "name": workflow_name,
-                "steps": steps,
-                "context": context or "",
-                "created": time.time(),
-                "frequency": 1
-            }
-            self.current_session.setdefault("procedural", {}).setdefault("workflows", []).append(wf)
-            self.current_session["last_updated"] = time.time()
-            self._save_current_session()
-            return f"⚙️ Recorded workflow '{workflow_name}' with {len(steps)} steps."
+            slot = self._workflow_index.get(workflow_name)
+            if slot is None:
+                wf = {
+                    "name": workflow_name,
+                    "steps": steps,
+                    "context": context or "",
+                    "created": _now(),
+                    "frequency": 1
+                }
+                self._record("workflow", {"slot": None, "workflow": wf})
+                self._workflow_index[workflow_name] = len(self.current_session["procedural"]["workflows"]) - 1
+                return f"⚙️ Recorded workflow '{workflow_name}' with {len(steps)} steps."
+            
+            # Known workflow: refresh its steps and bump usage
+            wf = dict(self.current_session["procedural"]["workflows"][slot])
+            wf["steps"] = steps
+            if context:
+                wf["context"] = context
+            wf["frequency"] = wf.get("frequency", 1) + 1
+            wf["last_used"] = _now()
+            self._record("workflow", {"slot": slot, "workflow": wf})
+            return f"⚙️ Updated workflow '{workflow_name}' with {len(steps)} steps (used {wf['frequency']}x)."
 
+    @_require_session
     def bb7_update_focus(self, focus_areas: List[str], energy_level: str = "medium", momentum: str = "steady") -> str:
         """Update current attention focus and energy state"""
-        if not self.current_session_id:
-            return "No active session. Start a session first with bb7_start_session."
-        if not self.current_session:
-            self._load_current_session()
         with self._lock:
-            meta = self.current_session.setdefault("metadata", {})
-            meta["attention_focus"] = focus_areas
-            meta["energy_level"] = energy_level
-            meta["momentum"] = momentum
-            self.current_session["last_updated"] = time.time()
-            self._save_current_session()
+            self._record("focus", {
+                "attention_focus": focus_areas,
+                "energy_level": energy_level,
+                "momentum": momentum
+            })
             return "✅ Focus updated"
 
     def get_tools(self) -> Dict[str, Dict[str, Any]]:
         """Return all available enhanced session tools with their metadata."""
-        return {
-            'bb7_start_session': {
-                "callable": self.bb7_start_session,
-                "metadata": {
-                    "name": "bb7_start_session",
-                    "description": "🎯 Begin a new cognitive development session with goal tracking, episodic memory, and workflow recording. Use when starting significant work, tackling new problems, or beginning focused development sessions. Creates structured memory for complex tasks.",
-                    "category": "sessions",
-                    "priority": "high",
-                    "when_to_use": ["new_project", "complex_task", "development_session", "focused_work"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "goal": { "type": "string", "description": "Clear objective for this session" },
-                            "context": { "type": "string", "description": "Background context or current situation" },
-                            "tags": { "type": "array", "items": {"type": "string"}, "description": "Categorization tags for the session" }
-                        },
-                        "required": ["goal"]
-                    }
-                }
-            },
-            'bb7_log_event': {
-                "callable": self.bb7_log_event,
-                "metadata": {
-                    "name": "bb7_log_event",
-                    "description": "📝 Record significant events, decisions, discoveries, or problems in the current session timeline. Use to build episodic memory of development process, track decision rationale, and create searchable development history.",
-                    "category": "sessions",
-                    "priority": "medium",
-                    "when_to_use": ["important_events", "decisions", "discoveries", "problems", "milestones"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "event_type": { "type": "string", "description": "Type: 'decision', 'discovery', 'problem', 'solution', 'insight'" },
-                            "description": { "type": "string", "description": "What happened and why it's significant" },
-                            "details": { "type": "object", "description": "Additional structured information" }
-                        },
-                        "required": ["event_type", "description"]
-                    }
-                }
-            },
-            'bb7_capture_insight': {
-                "callable": self.bb7_capture_insight,
-                "metadata": {
-                    "name": "bb7_capture_insight",
-                    "description": "💡 Record semantic insights, architectural understanding, or conceptual breakthroughs. Use when you or the user gain important understanding about the codebase, design patterns, or problem domain. Builds conceptual knowledge base.",
-                    "category": "sessions",
-                    "priority": "high",
-                    "when_to_use": ["insight_recording", "architecture", "design_patterns", "conceptual_breakthrough"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "insight": { "type": "string" },
-                            "concept": { "type": "string" },
-                            "relationships": { "type": "array", "items": {"type": "string"} }
-                        },
-                        "required": ["insight", "concept"]
-                    }
-                }
-            },
-            'bb7_get_session_insights': {
-                "callable": lambda session_id=None: self.bb7_get_session_insights(session_id),
-                "metadata": {
-                    "name": "bb7_get_session_insights",
-                    "description": "Generate a session intelligence report, highlighting key insights, breakthroughs, and cognitive metrics.",
-                    "category": "sessions",
-                    "priority": "medium",
-                    "when_to_use": ["session_reporting", "cognitive_metrics", "insight_generation"],
-                    "input_schema": {"type": "object", "properties": {"session_id": {"type": "string"}}, "required": []}
-                }
-            },
-            "bb7_cross_session_analysis": {
-                "callable": lambda days_back=30: self.bb7_cross_session_analysis(days_back),
-                "metadata": {
-                    "name": "bb7_cross_session_analysis",
-                    "description": "Analyze patterns, goals, and outcomes across multiple sessions. Use for longitudinal insights and workflow optimization.",
-                    "category": "sessions",
-                    "priority": "medium",
-                    "when_to_use": ["longitudinal_analysis", "workflow_optimization", "session_patterns"],
-                    "input_schema": {"type": "object", "properties": {"days_back": {"type": "integer", "default": 30}}, "required": []}
-                }
-            },
-            "bb7_session_recommendations": {
-                "callable": lambda goal: json.dumps(self._generate_session_recommendations(goal), indent=2),
-                "metadata": {
-                    "name": "bb7_session_recommendations",
-                    "description": "Provide recommendations for next actions or improvements based on session history and patterns.",
-                    "category": "sessions",
-                    "priority": "medium",
-                    "when_to_use": ["action_recommendations", "workflow_improvement", "session_guidance"],
-                    "input_schema": {"type": "object", "properties": {"goal": {"type": "string"}}, "required": ["goal"]}
-                }
-            },
-            'bb7_record_workflow': {
-                "callable": self.bb7_record_workflow,
-                "metadata": {
-                    "name": "bb7_record_workflow",
-                    "description": "⚙️ Document successful workflows, processes, or step-by-step procedures for future reuse. Use when you discover effective approaches, solve complex problems, or establish repeatable processes. Builds procedural knowledge.",
-                    "category": "sessions",
-                    "priority": "medium",
-                    "when_to_use": ["successful_workflows", "processes", "procedures", "solutions", "patterns"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "workflow_name": { "type": "string", "description": "Descriptive name for the workflow" },
-                            "steps": { "type": "array", "items": {"type": "string"}, "description": "Ordered list of steps" },
-                            "context": { "type": "string", "description": "When and how to use this workflow" }
-                        },
-                        "required": ["workflow_name", "steps"]
-                    }
-                }
-            },
-            'bb7_update_focus': {
-                "callable": self.bb7_update_focus,
-                "metadata": {
-                    "name": "bb7_update_focus",
-                    "description": "🎯 Update current attention focus and energy state. Use when switching contexts, changing priorities, or when user's focus shifts. Helps maintain awareness of current cognitive state and priorities.",
-                    "category": "sessions",
-                    "priority": "low",
-                    "when_to_use": ["context_switch", "priority_change", "focus_shift", "energy_tracking"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "focus_areas": { "type": "array", "items": {"type": "string"}, "description": "Current areas of focus and attention" },
-                            "energy_level": { "type": "string", "enum": ["low", "medium", "high"], "default": "medium" },
-                            "momentum": { "type": "string", "enum": ["starting", "building", "flowing", "slowing"], "default": "steady" }
-                        },
-                        "required": ["focus_areas"]
-                    }
-                }
-            },
-            'bb7_pause_session': {
-                "callable": self.bb7_pause_session,
-                "metadata": {
-                    "name": "bb7_pause_session",
-                    "description": "Pause the current session",
-                    "category": "sessions",
-                    "priority": "low",
-                    "when_to_use": ["pause_work", "interrupt_session"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": { "reason": { "type": "string", "description": "Reason for pausing" } },
-                        "required": []
-                    }
-                }
-            },
-            'bb7_resume_session': {
-                "callable": self.bb7_resume_session,
-                "metadata": {
-                    "name": "bb7_resume_session",
-                    "description": "Resume a paused session",
-                    "category": "sessions",
-                    "priority": "low",
-                    "when_to_use": ["resume_work", "continue_session"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": { "session_id": { "type": "string", "description": "ID of session to resume" } },
-                        "required": ["session_id"]
-                    }
-                }
-            },
-            'bb7_list_sessions': {
-                "callable": self.bb7_list_sessions,
-                "metadata": {
-                    "name": "bb7_list_sessions",
-                    "description": "List all sessions with optional status filter",
-                    "category": "sessions",
-                    "priority": "low",
-                    "when_to_use": ["session_overview", "find_session"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": { "status": { "type": "string", "description": "Filter by status (e.g., 'active', 'paused', 'completed')" }, "limit": { "type": "integer", "description": "Maximum number of sessions to return" } },
-                        "required": []
-                    }
-                }
-            },
-            'bb7_get_session_summary': {
-                "callable": self.bb7_get_session_summary,
-                "metadata": {
-                    "name": "bb7_get_session_summary",
-                    "description": "Get a detailed summary of a specific session",
-                    "category": "sessions",
-                    "priority": "low",
-                    "when_to_use": ["session_details", "review_session"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": { "session_id": { "type": "string", "description": "ID of session to summarize" } },
-                        "required": ["session_id"]
-                    }
-                }
-            },
-            "bb7_learned_patterns": {
-                "callable": lambda: json.dumps(self.learned_patterns, indent=2),
-                "metadata": {
-                    "name": "bb7_learned_patterns",
-                    "description": "Summarize recurring patterns, solutions, and best practices learned from past sessions and memories.",
-                    "category": "sessions",
-                    "priority": "medium",
-                    "when_to_use": ["pattern_recognition", "best_practices", "solution_summarization"],
-                    "input_schema": {"type": "object", "properties": {}, "required": []}
-                }
-            },
-            "bb7_session_intelligence": {
-                "callable": lambda: json.dumps(self.session_intelligence, indent=2),
-                "metadata": {
-                    "name": "bb7_session_intelligence",
-                    "description": "Show raw intelligence metrics learned across sessions.",
-                    "category": "sessions",
-                    "priority": "low",
-                    "when_to_use": ["metrics", "debug"],
-                    "input_schema": {"type": "object", "properties": {}, "required": []}
-                }
-            },
-            "bb7_link_memory_to_session": {
-                "callable": self.bb7_link_memory_to_session,
-                "metadata": {
-                    "name": "bb7_link_memory_to_session",
-                    "description": "Link a memory key to the current session",
-                    "category": "sessions",
-                    "priority": "low",
-                    "when_to_use": ["memory_linking"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": { "memory_key": { "type": "string", "description": "Memory key to link" } },
-                        "required": ["memory_key"]
-                    }
-                }
-            },
-            "bb7_auto_memory_stats": {
-                "callable": self.bb7_auto_memory_stats,
-                "metadata": {
-                    "name": "bb7_auto_memory_stats",
-                    "description": "Automatically compute and report memory usage statistics, trends, and optimization suggestions.",
-                    "category": "memory",
-                    "priority": "low",
-                    "when_to_use": ["memory_management", "resource_optimization", "usage_analysis"],
-                    "input_schema": {"type": "object", "properties": {}, "required": []}
-                }
+        if self._tools is None:
+            self._tools = {
+                name: {"callable": getattr(self, name), "metadata": metadata}
+                for name, metadata in _TOOL_METADATA.items()
             }
-        }
\ No newline at end of file
+        return self._tools
@@ -5,15 +5,159 @@ This tool provides full shell command execution capabilities,
 allowing Copilot to run any system command, script, or utility.
 No restrictions - designed for a dedicated coding environment.
 """
+import functools
+import importlib.util
+import itertools
+import locale
+import re
 import subprocess
 import os
 import time
-import platform
+import shutil
+import signal
+import sys
+import tempfile
 import logging
 import threading
-import psutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, Callable
+from typing import Any, Dict, List, Optional, Tuple, Callable
+
+# psutil is optional and only imported by the process/system tools that use it;
+# find_spec checks for it without loading it
+PSUTIL_AVAILABLE = importlib.util.find_spec("psutil") is not None
+_PSUTIL_MISSING = "psutil is not installed. Install with: pip install psutil"
+
+# Tool version probes shown by get_environment, run concurrently
+_VERSION_PROBES = (
+    ("Python", ("python", "--version")),
+    ("Git", ("git", "--version")),
+    ("Node.js", ("node", "--version")),
+)
+# Seconds a set of probe results is reused before the tools are asked again
+_PROBE_TTL = 30.0
+
+# Commands whose output is fixed for the process lifetime; successful runs are
+# reused per (command, cwd) for _RESULT_TTL seconds
+_CACHEABLE_COMMAND = re.compile(r"(?:git|python3?|node|npm|pip3?)\s+(?:--version|-V)|uname(?:\s+-[a-z]+)?|hostname")
+_RESULT_TTL = 60.0
+_RESULT_CACHE_SIZE = 128
+
+# Characters of command output shown; only enough bytes to fill them are kept
+# (4 bytes per character at most, plus one so overflow still shows as truncated)
+_STDOUT_LIMIT = 10000
+_STDERR_LIMIT = 5000
+_STDOUT_CAPTURE = _STDOUT_LIMIT * 4 + 1
+_STDERR_CAPTURE = _STDERR_LIMIT * 4 + 1
+_READ_CHUNK = 8192
+
+# list_processes samples at most this many processes, measuring CPU over one short interval
+_PROCESS_LIMIT = 500
+_CPU_SAMPLE_SECONDS = 0.1
+
+# Seconds kill_process waits for a background process after terminate, then after kill
+_KILL_GRACE_SECONDS = 0.2
+
+# Captured commands get their own process group so a timeout can stop everything they started
+_NEW_PROCESS_GROUP = ({"start_new_session": True} if os.name == 'posix'
+                      else {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP})
+
+
+def _drain_capped(pipe, buf: bytearray, cap: int) -> None:
+    """Read a pipe to EOF, keeping at most cap bytes so the child never blocks on a full pipe"""
+    with pipe:
+        while chunk := pipe.read1(_READ_CHUNK):
+            if len(buf) < cap:
+                buf += chunk[:cap - len(buf)]
+
+
+@functools.lru_cache(maxsize=None)
+def _platform_details() -> Tuple[Tuple[str, str], ...]:
+    """Platform fields for get_system_info; fixed for the life of the process"""
+    import platform
+    return (
+        ("Platform", platform.platform()),
+        ("System", platform.system()),
+        ("Release", platform.release()),
+        ("Version", platform.version()),
+        ("Machine", platform.machine()),
+        ("Processor", platform.processor()),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _cpu_counts() -> Tuple[Optional[int], Optional[int]]:
+    """Physical and logical core counts"""
+    import psutil
+    return psutil.cpu_count(logical=False), psutil.cpu_count()
+
+
+# run_script interpreters as (executable, inline-program flag); the script is passed as
+# an argument, never on stdin, so commands in it that read stdin cannot consume the
+# rest of the program. Unknown types run as bash. PowerShell always runs from a file
+_PYTHON = 'python' if sys.platform == 'win32' else 'python3'
+_SCRIPT_LAUNCHERS = {
+    'bash': ('bash', '-c'),
+    'sh': ('bash', '-c'),
+    'python': (_PYTHON, '-c'),
+    'py': (_PYTHON, '-c'),
+    'node': ('node', '-e'),
+    'js': ('node', '-e'),
+    'javascript': ('node', '-e'),
+}
+_DEFAULT_LAUNCHER = ('bash', '-c')
+_SCRIPT_EXTENSIONS = {'bash': '.sh', 'python': '.py', 'python3': '.py', 'node': '.js'}
+_POWERSHELL_TYPES = frozenset({'powershell', 'ps1'})
+# Longer scripts run from a temp file; keeps well inside the Windows command-line
+# limit and Linux's per-argument limit (128 KiB, i.e. 32000 chars at 4 bytes each)
+_MAX_INLINE_SCRIPT = 32000
+
+# Commands made only of these characters split into the same words /bin/sh would give;
+# anything else (quotes, expansions, redirections, non-ASCII) goes through the shell
+_DIRECT_COMMAND = re.compile(r'[A-Za-z0-9_./:,+@ \t-]+')
+# The shell runs these itself, and its version can differ from the binary on PATH
+# (dash's echo treats -e as text, /bin/echo does not), so they always go through it
+_SHELL_BUILTINS = frozenset({
+    'alias', 'bg', 'break', 'cd', 'command', 'continue', 'echo', 'eval', 'exec', 'exit',
+    'export', 'false', 'fc', 'fg', 'getopts', 'hash', 'jobs', 'kill', 'newgrp', 'printf',
+    'pwd', 'read', 'readonly', 'return', 'set', 'shift', 'test', 'times', 'trap', 'true',
+    'type', 'ulimit', 'umask', 'unalias', 'unset', 'wait',
+})
+
+
+def _direct_argv(command: str) -> Optional[List[str]]:
+    """argv to run a command without a shell, or None when it needs shell parsing"""
+    if os.name != 'posix' or not _DIRECT_COMMAND.fullmatch(command):
+        return None
+    argv = re.split(r'[ \t]+', command.strip(' \t'))
+    # Relative paths would be looked up from our cwd, not the command's working_dir
+    if argv[0] in _SHELL_BUILTINS or '/' in argv[0] or shutil.which(argv[0]) is None:
+        return None
+    return argv
+
+
+def _terminate_group(process: subprocess.Popen) -> None:
+    """Stop a timed-out command and its children: SIGTERM the group, then SIGKILL what is left"""
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                process.wait(timeout=_KILL_GRACE_SECONDS)
+            except subprocess.TimeoutExpired:
+                pass
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.send_signal(signal.CTRL_BREAK_EVENT)
+            process.kill()
+    except OSError:
+        pass  # The whole group has already exited
+    process.wait()
+
+
+def _decode_output(data: bytes) -> str:
+    """Decode captured output the way text-mode subprocess pipes would"""
+    text = data.decode(locale.getpreferredencoding(False), errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
 
 
 class ShellTool:
@@ -23,93 +167,165 @@ class ShellTool:
         self.logger = logging.getLogger(__name__)
         self.logger.info("Shell tool initialized with full command access")
         
-        # Track running processes for potential cleanup
+        # Track running processes for potential cleanup; the lock only guards dict
+        # access and is never held while waiting on a process
         self._active_processes = {}
-        self._process_counter = 0
+        self._process_ids = itertools.count(1)
         self._lock = threading.Lock()
+        
+        # One thread per version probe, started on first use; results are cached as (monotonic time, lines)
+        self._executor = ThreadPoolExecutor(max_workers=len(_VERSION_PROBES), thread_name_prefix="shell")
+        self._probe_cache: Optional[Tuple[float, List[str]]] = None
+        
+        # (command, cwd) -> (monotonic time, response) for _CACHEABLE_COMMAND runs
+        self._result_cache: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        
+        # get_tools() result, built on first call
+        self._tools: Optional[Dict[str, Dict[str, Any]]] = None
+    
+    def shutdown(self):
+        """Release the version probe threads"""
+        self._executor.shutdown(wait=False)
+    
+    def _resolve_cwd(self, working_dir: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Resolve the working directory, returning (cwd, error message)"""
+        if not working_dir:
+            return os.getcwd(), None
+        work_path = Path(working_dir).expanduser().resolve()
+        if not work_path.exists():
+            return None, f"Error: Working directory '{working_dir}' does not exist"
+        if not work_path.is_dir():
+            return None, f"Error: '{working_dir}' is not a directory"
+        return str(work_path), None
+    
+    def _format_result(self, command: str, cwd: str, returncode: int, stdout: str,
+                       stderr: str, execution_time: float) -> str:
+        """Format a finished command's exit code and output"""
+        parts = [
+            f"Command: {command}\n",
+            f"Working directory: {cwd}\n",
+            f"Exit code: {returncode}\n",
+            f"Execution time: {execution_time:.2f} seconds\n\n"
+        ]
+        
+        if stdout:
+            # Limit output size to prevent memory issues
+            parts.append("STDOUT:\n")
+            if len(stdout) > _STDOUT_LIMIT:
+                parts += (stdout[:_STDOUT_LIMIT], "\n... (output truncated, too long)")
+            else:
+                parts.append(stdout)
+            parts.append("\n")
+        
+        if stderr:
+            parts.append("STDERR:\n")
+            if len(stderr) > _STDERR_LIMIT:
+                parts += (stderr[:_STDERR_LIMIT], "\n... (error output truncated)")
+            else:
+                parts.append(stderr)
+            parts.append("\n")
+        
+        if returncode == 0:
+            self.logger.info(f"Command completed successfully: {command}")
+        else:
+            self.logger.warning(f"Command failed with exit code {returncode}: {command}")
+        
+        return "".join(parts)
+    
+    def _format_timeout(self, command: str, timeout: int, execution_time: float,
+                        stdout: Any = None, stderr: Any = None) -> str:
+        """Format a timed-out command with whatever output it produced"""
+        self.logger.error(f"Command timed out after {timeout} seconds: {command}")
+        parts = [
+            f"Error: Command timed out after {timeout} seconds\n",
+            f"Command: {command}\n",
+            f"Execution time: {execution_time:.2f} seconds\n"
+        ]
+        if stdout:
+            parts.append(f"Partial STDOUT: {stdout[:1000]}\n")
+        if stderr:
+            parts.append(f"Partial STDERR: {stderr[:1000]}\n")
+        return "".join(parts)
     
     def run_command(self, command: str, working_dir: Optional[str] = None, 
-                   timeout: int = 30, capture_output: bool = True) -> str:
-        """Execute a shell command and return results"""
+                   timeout: int = 30, capture_output: bool = True,
+                   exec_args: Optional[List[str]] = None) -> str:
+        """Execute a shell command and return results; exec_args runs that argv instead, with
+        stdin closed, and command is only what gets reported"""
         try:
-            # Resolve working directory
-            if working_dir:
-                work_path = Path(working_dir).expanduser().resolve()
-                if not work_path.exists():
-                    return f"Error: Working directory '{working_dir}' does not exist"
-                if not work_path.is_dir():
-                    return f"Error: '{working_dir}' is not a directory"
-                cwd = str(work_path)
-            else:
-                cwd = os.getcwd()
+            cwd, error = self._resolve_cwd(working_dir)
+            if error:
+                return error
+            
+            cache_key = None
+            if capture_output and exec_args is None and _CACHEABLE_COMMAND.fullmatch(command.strip()):
+                cache_key = (command, cwd)
+                cached = self._result_cache.get(cache_key)
+                if cached is not None and time.monotonic() - cached[0] < _RESULT_TTL:
+                    return cached[1]
             
             self.logger.info(f"Executing command: {command} (cwd: {cwd})")
             
             start_time = time.time()
+            # Simple commands skip the extra /bin/sh fork; anything else goes through the shell
+            argv = exec_args if exec_args is not None else _direct_argv(command)
+            # Programs passed as arguments must not read the server's own stdin
+            stdin = subprocess.DEVNULL if exec_args is not None else None
             
             # Execute the command with proper timeout handling
             if capture_output:
+                # The child inherits os.environ as-is; nothing here overrides it
+                process = subprocess.Popen(
+                    argv or command,
+                    shell=argv is None,
+                    cwd=cwd,
+                    stdin=stdin,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    **_NEW_PROCESS_GROUP
+                )
+                
+                # Output past the capture caps is read and dropped, so a runaway
+                # command cannot grow memory before the timeout stops it
+                stdout, stderr = bytearray(), bytearray()
+                readers = [
+                    threading.Thread(target=_drain_capped, args=(process.stdout, stdout, _STDOUT_CAPTURE), daemon=True),
+                    threading.Thread(target=_drain_capped, args=(process.stderr, stderr, _STDERR_CAPTURE), daemon=True)
+                ]
+                for reader in readers:
+                    reader.start()
+                
+                # Like communicate(), the timeout also covers background children still holding the pipes
+                deadline = time.monotonic() + timeout
                 try:
-                    # Additional protection: limit environment size to prevent hanging
-                    env = os.environ.copy()
-                    
-                    result = subprocess.run(
-                        command,
-                        shell=True,
-                        cwd=cwd,
-                        capture_output=True,
-                        text=True,
-                        timeout=timeout,
-                        env=env
-                    )
-                    
-                    execution_time = time.time() - start_time
-                    
-                    # Format the response
-                    response = f"Command: {command}\n"
-                    response += f"Working directory: {cwd}\n"
-                    response += f"Exit code: {result.returncode}\n"
-                    response += f"Execution time: {execution_time:.2f} seconds\n\n"
-                    
-                    if result.stdout:
-                        # Limit output size to prevent memory issues
-                        stdout = result.stdout
-                        if len(stdout) > 10000:
-                            stdout = stdout[:10000] + "\n... (output truncated, too long)"
-                        response += f"STDOUT:\n{stdout}\n"
-                    
-                    if result.stderr:
-                        stderr = result.stderr
-                        if len(stderr) > 5000:
-                            stderr = stderr[:5000] + "\n... (error output truncated)"
-                        response += f"STDERR:\n{stderr}\n"
-                    
-                    if result.returncode == 0:
-                        self.logger.info(f"Command completed successfully: {command}")
-                    else:
-                        self.logger.warning(f"Command failed with exit code {result.returncode}: {command}")
-                    
-                    return response
-                    
-                except subprocess.TimeoutExpired as e:
-                    execution_time = time.time() - start_time
-                    self.logger.error(f"Command timed out after {timeout} seconds: {command}")
-                    error_msg = f"Error: Command timed out after {timeout} seconds\n"
-                    error_msg += f"Command: {command}\n"
-                    error_msg += f"Execution time: {execution_time:.2f} seconds\n"
-                    if hasattr(e, 'stdout') and e.stdout:
-                        error_msg += f"Partial STDOUT: {e.stdout[:1000]}\n"
-                    if hasattr(e, 'stderr') and e.stderr:
-                        error_msg += f"Partial STDERR: {e.stderr[:1000]}\n"
-                    return error_msg
+                    process.wait(timeout=timeout)
+                    for reader in readers:
+                        reader.join(max(0.0, deadline - time.monotonic()))
+                    timed_out = any(reader.is_alive() for reader in readers)
+                except subprocess.TimeoutExpired:
+                    timed_out = True
+                
+                if timed_out:
+                    _terminate_group(process)
+                    return self._format_timeout(command, timeout, time.time() - start_time,
+                                                _decode_output(stdout), _decode_output(stderr))
+                
+                response = self._format_result(command, cwd, process.returncode, _decode_output(stdout),
+                                               _decode_output(stderr), time.time() - start_time)
+                if cache_key is not None and process.returncode == 0:
+                    if len(self._result_cache) >= _RESULT_CACHE_SIZE:
+                        self._result_cache.pop(next(iter(self._result_cache)))
+                    self._result_cache[cache_key] = (time.monotonic(), response)
+                return response
                 
             else:
                 # For commands that don't need output capture (like launching GUI apps)
+                self._reap_finished()
                 process = subprocess.Popen(
-                    command,
-                    shell=True,
+                    argv or command,
+                    shell=argv is None,
                     cwd=cwd,
-                    env=os.environ.copy()
+                    stdin=stdin
                 )
                 
                 # Give it a moment to start
@@ -117,9 +333,8 @@ class ShellTool:
                 
                 if process.poll() is None:
                     # Still running
+                    process_id = next(self._process_ids)
                     with self._lock:
-                        self._process_counter += 1
-                        process_id = self._process_counter
                         self._active_processes[process_id] = process
                     
                     return f"Command started in background: {command}\nProcess ID: {process_id}"
@@ -131,64 +346,59 @@ class ShellTool:
             self.logger.error(f"Error executing command '{command}': {e}")
             return f"Error executing command '{command}': {str(e)}"
     
+    def _reap_finished(self) -> None:
+        """Drop tracked background processes that have exited, so the table only holds live ones"""
+        with self._lock:
+            tracked = list(self._active_processes.items())
+        finished = [proc_id for proc_id, process in tracked if process.poll() is not None]
+        if finished:
+            with self._lock:
+                for proc_id in finished:
+                    self._active_processes.pop(proc_id, None)
+    
     def run_script(self, script_content: str, script_type: str = "bash", 
                   working_dir: Optional[str] = None) -> str:
         """Execute a script from content"""
+        script_file = None
         try:
-            # Determine script extension and shebang
-            if script_type.lower() in ['bash', 'sh']:
-                extension = '.sh'
-                shebang = '#!/bin/bash\n'
-            elif script_type.lower() in ['python', 'py']:
-                extension = '.py'
-                shebang = '#!/usr/bin/env python3\n'
-            elif script_type.lower() in ['node', 'js', 'javascript']:
-                extension = '.js'
-                shebang = '#!/usr/bin/env node\n'
-            elif script_type.lower() in ['powershell', 'ps1']:
-                extension = '.ps1'
-                shebang = ''
-            else:
-                extension = '.sh'
-                shebang = '#!/bin/bash\n'
-            
-            # Create temporary script file
-            temp_dir = Path("data/temp_scripts")
-            temp_dir.mkdir(exist_ok=True)
-            
-            script_file = temp_dir / f"script_{int(time.time())}{extension}"
-            
-            # Write script content
-            with open(script_file, 'w', encoding='utf-8') as f:
-                if shebang:
-                    f.write(shebang)
-                f.write(script_content)
-            
-            # Make executable (Unix-like systems)
-            try:
-                os.chmod(script_file, 0o755)
-            except:
-                pass  # Windows or permission issues
-            
-            # Execute the script
-            if script_type.lower() in ['powershell', 'ps1']:
-                command = f"powershell -ExecutionPolicy Bypass -File {script_file}"
+            kind = script_type.casefold()
+            if kind in _POWERSHELL_TYPES:
+                # -NoProfile skips the profile load
+                script_file = self._write_script_file(script_content, '.ps1')
+                exec_args = ['powershell', '-NoProfile', '-NonInteractive', '-ExecutionPolicy', 'Bypass',
+                             '-File', str(script_file)]
+                command = subprocess.list2cmdline(exec_args)
             else:
-                command = str(script_file)
-            
-            result = self.run_command(command, working_dir)
-            
-            # Cleanup
-            try:
-                script_file.unlink()
-            except:
-                pass
+                executable, inline_flag = _SCRIPT_LAUNCHERS.get(kind, _DEFAULT_LAUNCHER)
+                if len(script_content) <= _MAX_INLINE_SCRIPT:
+                    exec_args = [executable, inline_flag, script_content]
+                    command = f"{executable} {inline_flag} <script>"
+                else:
+                    script_file = self._write_script_file(script_content, _SCRIPT_EXTENSIONS[executable])
+                    exec_args = [executable, str(script_file)]
+                    command = subprocess.list2cmdline(exec_args)
+            result = self.run_command(command, working_dir, exec_args=exec_args)
             
             return f"Script execution result:\n{result}"
             
         except Exception as e:
             self.logger.error(f"Error executing script: {e}")
             return f"Error executing script: {str(e)}"
+        finally:
+            if script_file is not None:
+                try:
+                    script_file.unlink()
+                except OSError:
+                    pass
+    
+    def _write_script_file(self, script_content: str, extension: str) -> Path:
+        """Write a script to a uniquely named temp file; absolute so it resolves from working_dir"""
+        temp_dir = Path("data/temp_scripts").resolve()
+        temp_dir.mkdir(exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=temp_dir, prefix='script_',
+                                         suffix=extension, delete=False) as f:
+            f.write(script_content)
+        return Path(f.name)
     
     def get_environment(self) -> str:
         """Get current environment information"""
@@ -209,50 +419,7 @@ class ShellTool:
             if len(path_dirs) > 10:
                 info.append(f"  ... and {len(path_dirs) - 10} more")
             
-            # Python info - with shorter timeout and better error handling
-            try:
-                python_version = subprocess.run(['python', '--version'], 
-                                              capture_output=True, text=True, timeout=2)
-                if python_version.returncode == 0:
-                    info.append(f"Python: {python_version.stdout.strip()}")
-                else:
-                    info.append("Python: (not available)")
-            except subprocess.TimeoutExpired:
-                info.append("Python: (timeout - may be hanging)")
-            except FileNotFoundError:
-                info.append("Python: (not found)")
-            except Exception as e:
-                info.append(f"Python: (error - {str(e)[:50]})")
-            
-            # Git info - with shorter timeout and better error handling
-            try:
-                git_version = subprocess.run(['git', '--version'], 
-                                           capture_output=True, text=True, timeout=2)
-                if git_version.returncode == 0:
-                    info.append(f"Git: {git_version.stdout.strip()}")
-                else:
-                    info.append("Git: (not available)")
-            except subprocess.TimeoutExpired:
-                info.append("Git: (timeout - may be hanging)")
-            except FileNotFoundError:
-                info.append("Git: (not found)")
-            except Exception as e:
-                info.append(f"Git: (error - {str(e)[:50]})")
-            
-            # Node info - with shorter timeout and better error handling
-            try:
-                node_version = subprocess.run(['node', '--version'], 
-                                            capture_output=True, text=True, timeout=2)
-                if node_version.returncode == 0:
-                    info.append(f"Node.js: {node_version.stdout.strip()}")
-                else:
-                    info.append("Node.js: (not available)")
-            except subprocess.TimeoutExpired:
-                info.append("Node.js: (timeout - may be hanging)")
-            except FileNotFoundError:
-                info.append("Node.js: (not found)")
-            except Exception as e:
-                info.append(f"Node.js: (error - {str(e)[:50]})")
+            info.extend(self._probe_versions())
             
             return "Environment Information:\n" + "\n".join(info)
             
@@ -260,8 +427,40 @@ class ShellTool:
             self.logger.error(f"Error getting environment info: {e}")
             return f"Error getting environment info: {str(e)}"
     
+    def _probe(self, label: str, cmd: Tuple[str, ...]) -> str:
+        """Run one version probe and format its result line"""
+        # A PATH scan answers "not installed" without starting a process
+        executable = shutil.which(cmd[0])
+        if executable is None:
+            return f"{label}: (not found)"
+        try:
+            result = subprocess.run((executable, *cmd[1:]), capture_output=True, text=True, timeout=2)
+            if result.returncode == 0:
+                return f"{label}: {result.stdout.strip()}"
+            return f"{label}: (not available)"
+        except subprocess.TimeoutExpired:
+            return f"{label}: (timeout - may be hanging)"
+        except FileNotFoundError:
+            return f"{label}: (not found)"
+        except Exception as e:
+            return f"{label}: (error - {str(e)[:50]})"
+    
+    def _probe_versions(self) -> List[str]:
+        """Version lines for the probed tools, refreshed at most every _PROBE_TTL seconds"""
+        now = time.monotonic()
+        cached = self._probe_cache
+        if cached is not None and now - cached[0] < _PROBE_TTL:
+            return cached[1]
+        lines = list(self._executor.map(lambda probe: self._probe(*probe), _VERSION_PROBES))
+        self._probe_cache = (now, lines)
+        return lines
+    
     def list_processes(self) -> str:
         """List currently running processes on the system"""
+        if not PSUTIL_AVAILABLE:
+            return f"Error listing processes: {_PSUTIL_MISSING}"
+        # psutil is imported on first use so run_command-only servers never load it
+        import psutil
         try:
             info = []
             info.append("Currently running processes:\n")
@@ -271,7 +470,22 @@ class ShellTool:
             start_time = time.time()
             max_collection_time = 5.0  # Maximum 5 seconds to collect processes
             
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
+            # Limit total processes to prevent hanging
+            procs = list(itertools.islice(psutil.process_iter(['pid', 'name', 'memory_percent']), _PROCESS_LIMIT + 1))
+            if len(procs) > _PROCESS_LIMIT:
+                del procs[_PROCESS_LIMIT:]
+                info.append(f"(Showing first {_PROCESS_LIMIT} processes)")
+            
+            # cpu_percent(None) reports usage since the previous call on the same
+            # process, so prime every counter and read them all after one interval
+            for proc in procs:
+                try:
+                    proc.cpu_percent(None)
+                except psutil.Error:
+                    pass
+            time.sleep(_CPU_SAMPLE_SECONDS)
+            
+            for proc in procs:
                 try:
                     # Check timeout
                     if time.time() - start_time > max_collection_time:
@@ -279,14 +493,8 @@ class ShellTool:
                         break
                         
                     proc_info = proc.info
-                    # Get CPU percent without blocking (use cached value)
-                    proc_info['cpu_percent'] = proc.cpu_percent() or 0
+                    proc_info['cpu_percent'] = proc.cpu_percent(None)
                     processes.append(proc_info)
-                    
-                    # Limit total processes to prevent hanging
-                    if len(processes) >= 100:
-                        info.append("(Showing first 100 processes)")
-                        break
                         
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                     continue
@@ -312,19 +520,21 @@ class ShellTool:
             
             # Show our tracked background processes
             with self._lock:
-                if self._active_processes:
-                    info.append("\nBackground processes started by this tool:")
-                    finished = []
-                    for proc_id, process in self._active_processes.items():
-                        if process.poll() is not None:
-                            finished.append(proc_id)
-                            info.append(f"  Process {proc_id}: Finished (exit code: {process.returncode})")
-                        else:
-                            info.append(f"  Process {proc_id}: Running (PID: {process.pid})")
-                    
-                    # Remove finished processes
+                tracked = list(self._active_processes.items())
+            if tracked:
+                info.append("\nBackground processes started by this tool:")
+                finished = []
+                for proc_id, process in tracked:
+                    if process.poll() is not None:
+                        finished.append(proc_id)
+                        info.append(f"  Process {proc_id}: Finished (exit code: {process.returncode})")
+                    else:
+                        info.append(f"  Process {proc_id}: Running (PID: {process.pid})")
+                
+                # Remove finished processes
+                with self._lock:
                     for proc_id in finished:
-                        del self._active_processes[proc_id]
+                        self._active_processes.pop(proc_id, None)
             
             return "\n".join(info)
             
@@ -334,28 +544,16 @@ class ShellTool:
     
     def kill_process(self, process_id: int) -> str:
         """Kill a process by PID or background process ID"""
+        # First check if it's one of our tracked background processes; those need no psutil
+        with self._lock:
+            process = self._active_processes.pop(process_id, None)
+        if process is not None:
+            return self._kill_tracked(process_id, process)
+        
+        if not PSUTIL_AVAILABLE:
+            return f"Error killing process {process_id}: {_PSUTIL_MISSING}"
+        import psutil
         try:
-            # First check if it's one of our tracked background processes
-            with self._lock:
-                if process_id in self._active_processes:
-                    process = self._active_processes[process_id]
-                    
-                    try:
-                        if process.poll() is None:
-                            process.terminate()
-                            time.sleep(0.1)
-                            
-                            if process.poll() is None:
-                                process.kill()
-                                time.sleep(0.1)
-                        
-                        exit_code = process.poll()
-                        del self._active_processes[process_id]
-                        
-                        return f"Background process {process_id} terminated (exit code: {exit_code})"
-                    except Exception as e:
-                        return f"Error killing background process {process_id}: {str(e)}"
-            
             # If not a background process, try to kill by system PID
             proc = None
             proc_name = "unknown"
@@ -385,26 +583,48 @@ class ShellTool:
             self.logger.error(f"Error killing process {process_id}: {e}")
             return f"Error killing process {process_id}: {str(e)}"
     
+    def _kill_tracked(self, process_id: int, process: subprocess.Popen) -> str:
+        """Terminate a background process started by this tool, escalating to kill"""
+        try:
+            if process.poll() is None:
+                process.terminate()
+                # Returns as soon as the child exits instead of sleeping a fixed interval
+                try:
+                    process.wait(timeout=_KILL_GRACE_SECONDS)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    try:
+                        process.wait(timeout=_KILL_GRACE_SECONDS)
+                    except subprocess.TimeoutExpired:
+                        pass
+            
+            exit_code = process.poll()
+            
+            return f"Background process {process_id} terminated (exit code: {exit_code})"
+        except Exception as e:
+            # Keep tracking it so the kill can be retried
+            with self._lock:
+                self._active_processes[process_id] = process
+            return f"Error killing background process {process_id}: {str(e)}"
+    
     def get_system_info(self) -> str:
         """Get comprehensive system information"""
+        if not PSUTIL_AVAILABLE:
+            return f"Error getting system info: {_PSUTIL_MISSING}"
+        import psutil
         try:
             info = []
             
             # System basics
             info.append("System Information:")
-            info.append(f"  Platform: {platform.platform()}")
-            info.append(f"  System: {platform.system()}")
-            info.append(f"  Release: {platform.release()}")
-            info.append(f"  Version: {platform.version()}")
-            info.append(f"  Machine: {platform.machine()}")
-            info.append(f"  Processor: {platform.processor()}")
+            info.extend(f"  {label}: {value}" for label, value in _platform_details())
             
             # CPU information
-            cpu_count = psutil.cpu_count()
+            physical_cores, cpu_count = _cpu_counts()
             # Use non-blocking CPU percent check
             cpu_percent = psutil.cpu_percent() or 0
             info.append(f"\nCPU Information:")
-            info.append(f"  Physical cores: {psutil.cpu_count(logical=False)}")
+            info.append(f"  Physical cores: {physical_cores}")
             info.append(f"  Total cores: {cpu_count}")
             info.append(f"  Current usage: {cpu_percent}% (cached)")
             
@@ -449,94 +669,96 @@ class ShellTool:
     
     def get_tools(self) -> Dict[str, Dict[str, Any]]:
         """Return all available shell tools with their metadata."""
-        return {
-            'bb7_run_command': {
-                "callable": lambda command, working_dir=None, timeout=30: self.run_command(command, working_dir, timeout),
-                "metadata": {
-                    "name": "bb7_run_command",
-                    "description": "⚡ Execute shell commands with full output capture. Use for running builds, tests, git operations, system commands, or any command-line tasks. Provides detailed execution results.",
-                    "category": "shell",
-                    "priority": "high",
-                    "when_to_use": ["builds", "tests", "git_ops", "system_commands", "installation"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "command": { "type": "string", "description": "Shell command to execute" },
-                            "working_dir": { "type": "string", "description": "Working directory for command" },
-                            "timeout": { "type": "integer", "default": 30, "description": "Command timeout in seconds" }
-                        },
-                        "required": ["command"]
+        if self._tools is None:
+            self._tools = {
+                'bb7_run_command': {
+                    "callable": lambda command, working_dir=None, timeout=30: self.run_command(command, working_dir, timeout),
+                    "metadata": {
+                        "name": "bb7_run_command",
+                        "description": "⚡ Execute shell commands with full output capture. Use for running builds, tests, git operations, system commands, or any command-line tasks. Provides detailed execution results.",
+                        "category": "shell",
+                        "priority": "high",
+                        "when_to_use": ["builds", "tests", "git_ops", "system_commands", "installation"],
+                        "input_schema": {
+                            "type": "object",
+                            "properties": {
+                                "command": { "type": "string", "description": "Shell command to execute" },
+                                "working_dir": { "type": "string", "description": "Working directory for command" },
+                                "timeout": { "type": "integer", "default": 30, "description": "Command timeout in seconds" }
+                            },
+                            "required": ["command"]
+                        }
                     }
-                }
-            },
-            'bb7_run_script': {
-                "callable": lambda script_content, script_type="bash", working_dir=None: self.run_script(script_content, script_type, working_dir),
-                "metadata": {
-                    "name": "bb7_run_script",
-                    "description": "📜 Execute scripts from content strings. Supports bash, python, javascript, and powershell. Use for running complex multi-line scripts or generated code without creating temporary files.",
-                    "category": "shell",
-                    "priority": "medium",
-                    "when_to_use": ["script_execution", "code_testing", "automation", "multi_line_commands"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "script_content": { "type": "string", "description": "Script content to execute" },
-                            "script_type": { "type": "string", "enum": ["bash", "python", "javascript", "powershell"], "default": "bash" },
-                            "working_dir": { "type": "string", "description": "Working directory" }
-                        },
-                        "required": ["script_content"]
+                },
+                'bb7_run_script': {
+                    "callable": lambda script_content, script_type="bash", working_dir=None: self.run_script(script_content, script_type, working_dir),
+                    "metadata": {
+                        "name": "bb7_run_script",
+                        "description": "📜 Execute scripts from content strings. Supports bash, python, javascript, and powershell. Use for running complex multi-line scripts or generated code without creating temporary files.",
+                        "category": "shell",
+                        "priority": "medium",
+                        "when_to_use": ["script_execution", "code_testing", "automation", "multi_line_commands"],
+                        "input_schema": {
+                            "type": "object",
+                            "properties": {
+                                "script_content": { "type": "string", "description": "Script content to execute" },
+                                "script_type": { "type": "string", "enum": ["bash", "python", "javascript", "powershell"], "default": "bash" },
+                                "working_dir": { "type": "string", "description": "Working directory" }
+                            },
+                            "required": ["script_content"]
+                        }
                     }
-                }
-            },
-            'bb7_get_environment': {
-                "callable": self.get_environment,
-                "metadata": {
-                    "name": "bb7_get_environment",
-                    "description": "🌍 Get comprehensive environment information including PATH, user context, installed tools, and development environment details. Use for troubleshooting, setup verification, or environment analysis.",
-                    "category": "shell",
-                    "priority": "low",
-                    "when_to_use": ["environment_check", "troubleshooting", "setup_verification", "tool_discovery"],
-                    "input_schema": { "type": "object", "properties": {}, "required": [] }
-                }
-            },
-            'bb7_list_processes': {
-                "callable": self.list_processes,
-                "metadata": {
-                    "name": "bb7_list_processes",
-                    "description": "🔄 List running system processes with CPU and memory usage. Use for system monitoring, finding processes, or understanding system state.",
-                    "category": "shell",
-                    "priority": "low",
-                    "when_to_use": ["system_monitoring", "process_discovery", "performance_analysis", "debugging"],
-                    "input_schema": { "type": "object", "properties": {}, "required": [] }
-                }
-            },
-            'bb7_kill_process': {
-                "callable": self.kill_process,
-                "metadata": {
-                    "name": "bb7_kill_process",
-                    "description": "🛑 Terminate processes by PID. Use carefully for stopping hung processes or cleaning up background tasks. Includes safety checks.",
-                    "category": "shell",
-                    "priority": "low",
-                    "when_to_use": ["process_termination", "cleanup", "hung_processes", "system_management"],
-                    "input_schema": {
-                        "type": "object",
-                        "properties": { "process_id": { "type": "integer", "description": "Process ID to terminate" } },
-                        "required": ["process_id"]
+                },
+                'bb7_get_environment': {
+                    "callable": self.get_environment,
+                    "metadata": {
+                        "name": "bb7_get_environment",
+                        "description": "🌍 Get comprehensive environment information including PATH, user context, installed tools, and development environment details. Use for troubleshooting, setup verification, or environment analysis.",
+                        "category": "shell",
+                        "priority": "low",
+                        "when_to_use": ["environment_check", "troubleshooting", "setup_verification", "tool_discovery"],
+                        "input_schema": { "type": "object", "properties": {}, "required": [] }
+                    }
+                },
+                'bb7_list_processes': {
+                    "callable": self.list_processes,
+                    "metadata": {
+                        "name": "bb7_list_processes",
+                        "description": "🔄 List running system processes with CPU and memory usage. Use for system monitoring, finding processes, or understanding system state.",
+                        "category": "shell",
+                        "priority": "low",
+                        "when_to_use": ["system_monitoring", "process_discovery", "performance_analysis", "debugging"],
+                        "input_schema": { "type": "object", "properties": {}, "required": [] }
+                    }
+                },
+                'bb7_kill_process': {
+                    "callable": self.kill_process,
+                    "metadata": {
+                        "name": "bb7_kill_process",
+                        "description": "🛑 Terminate processes by PID. Use carefully for stopping hung processes or cleaning up background tasks. Includes safety checks.",
+                        "category": "shell",
+                        "priority": "low",
+                        "when_to_use": ["process_termination", "cleanup", "hung_processes", "system_management"],
+                        "input_schema": {
+                            "type": "object",
+                            "properties": { "process_id": { "type": "integer", "description": "Process ID to terminate" } },
+                            "required": ["process_id"]
+                        }
+                    }
+                },
+                'bb7_get_system_info': {
+                    "callable": self.get_system_info,
+                    "metadata": {
+                        "name": "bb7_get_system_info",
+                        "description": "💻 Get comprehensive system information including hardware, OS, CPU, memory, disk, and network details. Use for system analysis, troubleshooting, or environment documentation.",
+                        "category": "shell",
+                        "priority": "low",
+                        "when_to_use": ["system_analysis", "hardware_info", "troubleshooting", "documentation"],
+                        "input_schema": { "type": "object", "properties": {}, "required": [] }
                     }
-                }
-            },
-            'bb7_get_system_info': {
-                "callable": self.get_system_info,
-                "metadata": {
-                    "name": "bb7_get_system_info",
-                    "description": "💻 Get comprehensive system information including hardware, OS, CPU, memory, disk, and network details. Use for system analysis, troubleshooting, or environment documentation.",
-                    "category": "shell",
-                    "priority": "low",
-                    "when_to_use": ["system_analysis", "hardware_info", "troubleshooting", "documentation"],
-                    "input_schema": { "type": "object", "properties": {}, "required": [] }
                 }
             }
-        }
+        return self._tools
 
 
 # For standalone testing
@@ -8,6 +8,7 @@ import base64
 import io
 import json
 import logging
+import math
 import os
 import platform
 import subprocess
@@ -25,7 +26,7 @@ except ImportError:
     MSS_AVAILABLE = False
 
 try:
-    from PIL import Image, ImageDraw, ImageFont
+    from PIL import Image, ImageChops, ImageDraw, ImageFont
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
@@ -383,7 +384,6 @@ class VisualTool:
             image2_path = args["image2_path"]
             threshold = args.get("threshold", 0.1)
             
-            img1 = Image.open(image1_path)
             img1 = Image.open(image1_path)
             img2 = Image.open(image2_path)
             
@@ -393,26 +393,12 @@ class VisualTool:
             gray1 = img1.convert('L')
             gray2 = img2.convert('L')
             
-            diff_pixels = 0
             total_pixels = img1.width * img1.height
             
-            for x in range(img1.width):
-                for y in range(img1.height):
-                    pixel1 = gray1.getpixel((x, y))
-                    pixel2 = gray2.getpixel((x, y))
-                    
-                    # Ensure pixel values are integers before subtraction
-                    if isinstance(pixel1, (tuple, list)):
-                        pixel1 = pixel1[0]  # Take first channel for RGB
-                    if isinstance(pixel2, (tuple, list)):
-                        pixel2 = pixel2[0]  # Take first channel for RGB
-                    
-                    # Handle None values
-                    if pixel1 is None or pixel2 is None:
-                        continue
-                    
-                    if abs(int(pixel1) - int(pixel2)) > threshold * 255:
-                        diff_pixels += 1
+            # Per-pixel |gray1 - gray2| computed in C; the histogram of those 0-255 values
+            # counts pixels whose difference exceeds threshold * 255
+            histogram = ImageChops.difference(gray1, gray2).histogram()
+            diff_pixels = sum(histogram[max(0, math.floor(threshold * 255) + 1):])
             
             difference_ratio = diff_pixels / total_pixels
             